@@ -1,16 +1,47 @@
 """
 Authentication Endpoints
-Routes for user registration and login
+Routes for user registration, login, token refresh and logout
 """
+import logging
 from fastapi import APIRouter, HTTPException, Depends, status
-from app.schemas.user import UserCreate, UserLogin, UserResponse
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.schemas.user import UserCreate, UserLogin, UserResponse, TokenResponse, RefreshRequest
+from app.core.config import settings
+from app.core.resilience import UNAVAILABLE_ERRORS, redis_breaker
+from app.core.security import get_password_hash, verify_password, create_access_token, parse_refresh_token
 from app.db.mongodb import get_database
+from app.db.redis import get_redis
+from app.services.session_service import SessionService, RefreshTokenError, RefreshTokenReuseError
 from motor.motor_asyncio import AsyncIOMotorDatabase
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+async def get_session_service(redis_client: redis.Redis = Depends(get_redis)) -> SessionService:
+    """Dependency to get SessionService instance."""
+    return SessionService(redis_client)
+
+
+def _token_response(user_id: str, session_id: str, refresh_token: str) -> dict:
+    return {
+        "access_token": create_access_token(subject=user_id, session_id=session_id),
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "user_id": user_id,
+    }
+
+
+def _sessions_unavailable(action: str, e: Exception) -> HTTPException:
+    logger.error(f"Session store unavailable during {action}: {str(e) or type(e).__name__}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication temporarily unavailable"
+    )
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_in: UserCreate, db: AsyncIOMotorDatabase = Depends(get_database)):
     """
@@ -47,20 +78,26 @@ async def register(user_in: UserCreate, db: AsyncIOMotorDatabase = Depends(get_d
     return user_data
 
 
-@router.post("/login")
-async def login(user_in: UserLogin, db: AsyncIOMotorDatabase = Depends(get_database)):
+@router.post("/login", response_model=TokenResponse)
+async def login(
+    user_in: UserLogin,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    sessions: SessionService = Depends(get_session_service),
+):
     """
-    Authenticate user and return JWT access token.
+    Authenticate user and return a JWT access token plus a refresh token.
     
     Args:
         user_in: UserLogin schema containing email and password
         db: MongoDB database connection
+        sessions: SessionService dependency
     
     Returns:
-        Dictionary with access_token, token_type, and user_id
+        TokenResponse with access_token, refresh_token, token_type, expires_in and user_id
     
     Raises:
-        HTTPException: If email is not found or password is incorrect
+        HTTPException: 401 if email is not found or password is incorrect,
+            503 if Redis is unavailable
     """
     user = await db["users"].find_one({"email": user_in.email})
     if not user or not verify_password(user_in.password, user["hashed_password"]):
@@ -70,9 +107,84 @@ async def login(user_in: UserLogin, db: AsyncIOMotorDatabase = Depends(get_datab
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = create_access_token(subject=str(user["_id"]))
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user_id": str(user["_id"])
-    }
+    user_id = str(user["_id"])
+    try:
+        session_id, refresh_token = await redis_breaker.call(sessions.create(user_id))
+    except UNAVAILABLE_ERRORS as e:
+        raise _sessions_unavailable("login", e)
+    return _token_response(user_id, session_id, refresh_token)
+
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(
+    refresh_in: RefreshRequest,
+    sessions: SessionService = Depends(get_session_service),
+):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+    
+    Costs a single Redis round trip instead of a user lookup and bcrypt
+    verification. Refresh tokens rotate: each one can be used once, and
+    presenting an already used token revokes the whole session.
+    
+    Args:
+        refresh_in: RefreshRequest containing the current refresh token
+        sessions: SessionService dependency
+    
+    Returns:
+        TokenResponse with a new access_token and refresh_token
+    
+    Raises:
+        HTTPException: 401 if the refresh token is invalid, expired, revoked or
+            reused, 503 if Redis is unavailable
+    """
+    try:
+        user_id, session_id, refresh_token = await redis_breaker.call(sessions.rotate(refresh_in.refresh_token))
+    except UNAVAILABLE_ERRORS as e:
+        raise _sessions_unavailable("refresh", e)
+    except RefreshTokenReuseError as e:
+        logger.warning(f"Refresh token reuse detected, session revoked: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except RefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return _token_response(user_id, session_id, refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    refresh_in: RefreshRequest,
+    sessions: SessionService = Depends(get_session_service),
+):
+    """
+    Revoke the session behind a refresh token.
+    
+    The refresh token stops working immediately, and access tokens issued
+    for the session are rejected for the rest of their lifetime. Only the
+    session's current refresh token can end it; anything else is ignored,
+    and the response is 204 either way so it doesn't reveal whether a
+    session exists.
+    
+    Args:
+        refresh_in: RefreshRequest containing the session's refresh token
+        sessions: SessionService dependency
+    
+    Raises:
+        HTTPException: 400 if the refresh token is malformed, 503 if Redis is unavailable
+    """
+    if parse_refresh_token(refresh_in.refresh_token) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid refresh token"
+        )
+    try:
+        await redis_breaker.call(sessions.revoke_with_token(refresh_in.refresh_token))
+    except UNAVAILABLE_ERRORS as e:
+        raise _sessions_unavailable("logout", e)
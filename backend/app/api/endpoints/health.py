@@ -0,0 +1,25 @@
+"""
+Health Endpoints
+Dependency health for monitoring: circuit breaker states and fallback counts
+"""
+from fastapi import APIRouter
+from app.core.resilience import health_snapshot
+from app.services.catalog_replica import catalog_replica
+
+router = APIRouter()
+
+
+@router.get("/")
+async def health():
+    """
+    Report this worker's view of its dependencies.
+    
+    `status` is "degraded" while any circuit breaker is not closed.
+    `fallbacks` counts how often each degraded path was taken since the
+    worker started (e.g. local cache reads, stale pages served).
+    `replica` describes the catalog replica, including its staleness.
+    
+    Returns:
+        Dictionary with status, breakers, fallbacks and replica
+    """
+    return {**health_snapshot(), "replica": catalog_replica.snapshot()}
@@ -3,15 +3,29 @@ Products/Items Endpoints
 Routes for CRUD operations on products with Redis caching for GET requests
 Role-based access control: DELETE and PUT require admin role
 """
+import asyncio
 import json
 import logging
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Header
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
 from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
-from app.services.product_service import ProductService
+from app.schemas.stats import CatalogStats
+from app.schemas.job import JobResponse
+from app.services.product_service import ProductService, PRODUCT_RESPONSE_PROJECTION
+from app.services.catalog_replica import catalog_replica
+from app.services.events import product_events
+from app.services.job_service import JobQueue
+from app.services.product_cache import ProductPageCache, page_key
+from app.api.endpoints.jobs import get_job_queue
 from app.db.mongodb import get_database
-from app.db.redis import get_redis
+from app.db.redis import get_redis_binary
+from app.core.compression import compress_body, negotiate
+from app.core.config import settings
 from app.core.dependencies import require_admin, require_user
+from app.core.resilience import UNAVAILABLE_ERRORS, mongo_breaker, record_fallback
+from app.core.timing import span
 from motor.motor_asyncio import AsyncIOMotorDatabase
 import redis.asyncio as redis
 
@@ -19,21 +33,28 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-CACHE_EXPIRATION = 300  # 5 minutes
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[ProductResponse])
 
 
 async def get_product_service(
     db: AsyncIOMotorDatabase = Depends(get_database),
 ) -> ProductService:
     """Dependency to get ProductService instance."""
-    return ProductService(db)
+    return ProductService(db, events=product_events, replica=catalog_replica)
+
+
+async def get_product_cache(
+    redis_client: redis.Redis = Depends(get_redis_binary),
+) -> ProductPageCache:
+    """Dependency to get the product list cache."""
+    return ProductPageCache(redis_client)
 
 
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 async def create_product(
     product_in: ProductCreate,
     service: ProductService = Depends(get_product_service),
-    redis_client: redis.Redis = Depends(get_redis),
+    cache: ProductPageCache = Depends(get_product_cache),
     current_user: dict = Depends(require_user),
 ):
     """
@@ -43,7 +64,7 @@ async def create_product(
     Args:
         product_in: ProductCreate schema with name, price, category
         service: ProductService dependency
-        redis_client: Redis connection for cache invalidation
+        cache: Product list cache to invalidate
         current_user: Current authenticated user
     
     Returns:
@@ -53,84 +74,274 @@ async def create_product(
         product = await service.create_product(product_in)
         
         # Invalidate the products list cache
-        await redis_client.delete("products_list")
+        await cache.invalidate()
         logger.info(f"Product created by {current_user['email']}: {product['_id']}")
         
         return product
+    except UNAVAILABLE_ERRORS as e:
+        logger.error(f"Database unavailable while creating product: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Product catalog temporarily unavailable"
+        )
     except Exception as e:
         logger.error(f"Error creating product: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create product"
         )
-    finally:
-        await redis_client.close()
+
+
+def encode_product_page(products: List[dict]) -> bytes:
+    """
+    Validate and encode a page of product documents to JSON bytes in one pass.
+    
+    Produces the same body FastAPI would for List[ProductResponse], but the
+    bytes can be cached and served as-is, so a page is encoded once instead
+    of once for Redis and again for the response.
+    """
+    for product in products:
+        # Documents come straight from the driver, so mutate in place rather than copy
+        product["_id"] = str(product["_id"])
+    return PRODUCT_LIST_ADAPTER.dump_json(PRODUCT_LIST_ADAPTER.validate_python(products), by_alias=True)
+
+
+def replica_headers() -> dict:
+    return {"X-Replica-Staleness": f"{catalog_replica.staleness():.3f}"}
+
+
+def page_response(payload: bytes, content_encoding: Optional[str], headers: Optional[dict] = None) -> Response:
+    """JSON response for an encoded page; CompressionMiddleware leaves it alone if already compressed."""
+    headers = dict(headers or {})
+    if content_encoding is not None:
+        headers["Content-Encoding"] = content_encoding
+        headers["Vary"] = "Accept-Encoding"
+    return Response(content=payload, media_type="application/json", headers=headers)
 
 
 @router.get("/", response_model=List[ProductResponse])
 async def list_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    category: Optional[str] = Query(None),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding"),
     service: ProductService = Depends(get_product_service),
-    redis_client: redis.Redis = Depends(get_redis),
+    cache: ProductPageCache = Depends(get_product_cache),
     current_user: dict = Depends(require_user),
 ):
     """
-    List all products with Redis caching.
+    List products, optionally filtered by category and price range, with Redis caching.
     Requires authentication.
     
-    First checks Redis cache. If not found, fetches from MongoDB and caches the result.
+    Products are returned in id order. With the catalog replica enabled the
+    page is built from this worker's in-memory copy, without Redis or
+    MongoDB, and `X-Replica-Staleness` reports how many seconds ago the
+    copy was last confirmed in sync.
+    
+    Otherwise first checks Redis cache. If not found, fetches only the response fields
+    from MongoDB, encodes the page to JSON once and uses the same bytes for
+    the cache entry and the response. Cache hits are served without parsing.
+    
+    Pages of at least `COMPRESSION_MIN_BYTES` are compressed with the
+    encoding negotiated from `Accept-Encoding` (zstd or gzip); the
+    compressed bytes are cached next to the page, so hits are not
+    compressed again.
+    
+    Degrades instead of failing: if Redis is unavailable the worker's local
+    copy is used, and if MongoDB is unavailable the last cached copy of the
+    page is served with `X-Cache-Status: stale`.
     
     Args:
         skip: Number of products to skip for pagination
         limit: Maximum number of products to return
+        category: Only products in this category
+        min_price: Only products priced at least this much
+        max_price: Only products priced at most this much
+        accept_encoding: Accept-Encoding request header
         service: ProductService dependency
-        redis_client: Redis connection for caching
+        cache: Product list cache
         current_user: Current authenticated user
     
     Returns:
         List of ProductResponse objects
+    
+    Raises:
+        HTTPException: 503 if MongoDB is unavailable and no copy of the page exists
     """
-    cache_key = f"products_list:skip:{skip}:limit:{limit}"
+    filters = {"category": category, "min_price": min_price, "max_price": max_price}
+    page = page_key(skip, limit, filters)
+    encoding = negotiate(accept_encoding)
     
     try:
+        if catalog_replica.ready:
+            with span("replica"):
+                products = catalog_replica.query(skip=skip, limit=limit, **filters)
+            with span("serialize"):
+                body = encode_product_page(products)
+            return page_response(*compress_body(body, encoding), headers=replica_headers())
+        
         # Try to get from cache
-        cached_data = await redis_client.get(cache_key)
-        if cached_data:
-            logger.info(f"Cache hit for {cache_key}")
-            products = json.loads(cached_data)
-            return products
+        with span("cache"):
+            cached = await cache.get(page, encoding)
+        if cached:
+            logger.info(f"Cache hit for {page}")
+            return page_response(*cached)
         
         # Cache miss - fetch from MongoDB
-        logger.info(f"Cache miss for {cache_key} - fetching from MongoDB")
-        products = await service.get_products(skip=skip, limit=limit)
+        logger.info(f"Cache miss for {page} - fetching from MongoDB")
+        try:
+            with span("db"):
+                products = await mongo_breaker.call(service.get_products(
+                    skip=skip, limit=limit, projection=PRODUCT_RESPONSE_PROJECTION, **filters
+                ))
+        except UNAVAILABLE_ERRORS as e:
+            logger.error(f"MongoDB unavailable, serving stale {page}: {str(e)}")
+            with span("cache"):
+                body = await cache.get_stale(page)
+            if body is None:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Product catalog temporarily unavailable"
+                )
+            record_fallback("mongodb.stale_page")
+            return Response(content=body, media_type="application/json",
+                            headers={"X-Cache-Status": "stale"})
         
-        # Convert ObjectId to string for JSON serialization
-        products_serialized = [
-            {**p, "_id": str(p["_id"])} for p in products
-        ]
+        with span("serialize"):
+            body = encode_product_page(products)
+        payload, content_encoding = compress_body(body, encoding)
         
         # Store in cache with expiration
-        await redis_client.setex(
-            cache_key,
-            CACHE_EXPIRATION,
-            json.dumps(products_serialized, default=str)
-        )
+        with span("cache"):
+            await cache.set(page, body, variants={content_encoding: payload} if content_encoding else None)
         
-        return products_serialized
+        return page_response(payload, content_encoding)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing products: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch products"
         )
-    finally:
-        await redis_client.close()
+
+
+@router.get("/stats", response_model=CatalogStats)
+async def get_catalog_stats(
+    service: ProductService = Depends(get_product_service),
+    current_user: dict = Depends(require_user),
+):
+    """
+    Get per-category product count, min/max/avg price and price histogram.
+    Requires authentication.
+    
+    Served from the incrementally maintained `product_stats` summary
+    collection, so the cost grows with the number of categories rather
+    than the number of products.
+    
+    Args:
+        service: ProductService dependency
+        current_user: Current authenticated user
+    
+    Returns:
+        CatalogStats with one entry per category
+    """
+    try:
+        return await service.stats.get_stats()
+    except Exception as e:
+        logger.error(f"Error fetching catalog stats: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch catalog stats"
+        )
+
+
+@router.post("/stats/recompute", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def recompute_catalog_stats(
+    queue: JobQueue = Depends(get_job_queue),
+    current_user: dict = Depends(require_admin),
+):
+    """
+    Queue a full rebuild of the catalog statistics.
+    **Admin only**
+    
+    The rebuild runs as a `stats.recompute` background job using a single
+    aggregation pipeline. Use after bulk changes made outside the API or to
+    repair drift.
+    
+    Args:
+        queue: JobQueue dependency
+        current_user: Current authenticated user (admin role required)
+    
+    Returns:
+        JobResponse for the queued job
+    """
+    try:
+        job = await queue.enqueue("stats.recompute")
+        logger.info(f"Catalog stats recompute {job['id']} queued by admin {current_user['email']}")
+        return job
+    except Exception as e:
+        logger.error(f"Error queuing catalog stats recompute: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue catalog stats recompute"
+        )
+
+
+@router.get("/events")
+async def stream_product_events(
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    current_user: dict = Depends(require_user),
+):
+    """
+    Stream product changes as Server-Sent Events.
+    Requires authentication.
+    
+    Each event carries the product id, the operation (create, update,
+    delete) and the changed fields. Reconnecting with the `Last-Event-ID`
+    header replays missed events; if they are no longer buffered a `reset`
+    event tells the client to refetch the list.
+    
+    Args:
+        last_event_id: Id of the last event the client received
+        current_user: Current authenticated user
+    
+    Returns:
+        text/event-stream response
+    """
+    subscriber = product_events.subscribe(last_event_id)
+
+    async def event_stream():
+        try:
+            yield f"retry: {settings.PRODUCT_EVENTS_RETRY_MS}\n\n"
+            while not (subscriber.dropped and subscriber.queue.empty()):
+                try:
+                    event = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=settings.PRODUCT_EVENTS_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from timing out the connection
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield f"id: {event['id']}\nevent: {event['op']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            product_events.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: str,
+    response: Response,
     service: ProductService = Depends(get_product_service),
     current_user: dict = Depends(require_user),
 ):
@@ -138,8 +349,13 @@ async def get_product(
     Get a specific product by ID.
     Requires authentication.
     
+    Served from the catalog replica when it is enabled; products it does
+    not have yet (e.g. created moments ago on another worker) are read
+    from MongoDB.
+    
     Args:
         product_id: MongoDB ObjectId of the product
+        response: Response, for the replica staleness header
         service: ProductService dependency
         current_user: Current authenticated user
     
@@ -150,7 +366,13 @@ async def get_product(
         HTTPException: If product not found
     """
     try:
-        product = await service.get_product(product_id)
+        if catalog_replica.ready:
+            product = catalog_replica.get(product_id)
+            if product is not None:
+                response.headers.update(replica_headers())
+                return product
+        
+        product = await mongo_breaker.call(service.get_product(product_id))
         if not product:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -159,6 +381,12 @@ async def get_product(
         return product
     except HTTPException:
         raise
+    except UNAVAILABLE_ERRORS as e:
+        logger.error(f"Database unavailable while fetching product {product_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Product catalog temporarily unavailable"
+        )
     except Exception as e:
         logger.error(f"Error fetching product {product_id}: {str(e)}")
         raise HTTPException(
@@ -172,7 +400,7 @@ async def update_product(
     product_id: str,
     product_in: ProductUpdate,
     service: ProductService = Depends(get_product_service),
-    redis_client: redis.Redis = Depends(get_redis),
+    cache: ProductPageCache = Depends(get_product_cache),
     current_user: dict = Depends(require_admin),
 ):
     """
@@ -183,7 +411,7 @@ async def update_product(
         product_id: MongoDB ObjectId of the product
         product_in: ProductUpdate schema with fields to update
         service: ProductService dependency
-        redis_client: Redis connection for cache invalidation
+        cache: Product list cache to invalidate
         current_user: Current authenticated user (admin role required)
     
     Returns:
@@ -201,27 +429,31 @@ async def update_product(
             )
         
         # Invalidate related caches
-        await redis_client.delete("products_list")
+        await cache.invalidate()
         logger.info(f"Product {product_id} updated by admin {current_user['email']}")
         
         return product
     except HTTPException:
         raise
+    except UNAVAILABLE_ERRORS as e:
+        logger.error(f"Database unavailable while updating product {product_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Product catalog temporarily unavailable"
+        )
     except Exception as e:
         logger.error(f"Error updating product {product_id}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update product"
         )
-    finally:
-        await redis_client.close()
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_product(
     product_id: str,
     service: ProductService = Depends(get_product_service),
-    redis_client: redis.Redis = Depends(get_redis),
+    cache: ProductPageCache = Depends(get_product_cache),
     current_user: dict = Depends(require_admin),
 ):
     """
@@ -231,7 +463,7 @@ async def delete_product(
     Args:
         product_id: MongoDB ObjectId of the product
         service: ProductService dependency
-        redis_client: Redis connection for cache invalidation
+        cache: Product list cache to invalidate
         current_user: Current authenticated user (admin role required)
     
     Raises:
@@ -246,16 +478,20 @@ async def delete_product(
             )
         
         # Invalidate related caches
-        await redis_client.delete("products_list")
+        await cache.invalidate()
         logger.info(f"Product {product_id} deleted by admin {current_user['email']}")
         
     except HTTPException:
         raise
+    except UNAVAILABLE_ERRORS as e:
+        logger.error(f"Database unavailable while deleting product {product_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Product catalog temporarily unavailable"
+        )
     except Exception as e:
         logger.error(f"Error deleting product {product_id}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete product"
         )
-    finally:
-        await redis_client.close()
@@ -0,0 +1,90 @@
+"""
+Background Job Endpoints
+Routes for enqueuing long-running catalog work and polling its status
+Jobs are executed by the separate worker process (python -m app.worker)
+"""
+import logging
+from fastapi import APIRouter, HTTPException, Depends, status
+from app.schemas.job import JobCreate, JobResponse
+from app.services.job_service import JobQueue
+from app.services.job_handlers import JOB_HANDLERS
+from app.db.redis import get_redis
+from app.core.dependencies import require_admin
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+async def get_job_queue(redis_client: redis.Redis = Depends(get_redis)) -> JobQueue:
+    """Dependency to get JobQueue instance."""
+    return JobQueue(redis_client)
+
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    job_in: JobCreate,
+    queue: JobQueue = Depends(get_job_queue),
+    current_user: dict = Depends(require_admin),
+):
+    """
+    Enqueue a background job and return immediately.
+    **Admin only**
+    
+    Args:
+        job_in: JobCreate schema with job type and payload
+        queue: JobQueue dependency
+        current_user: Current authenticated user (admin role required)
+    
+    Returns:
+        JobResponse for the queued job; poll GET /jobs/{job_id} for progress
+    
+    Raises:
+        HTTPException: If the job type is unknown
+    """
+    if job_in.type not in JOB_HANDLERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown job type {job_in.type}. Available: {', '.join(sorted(JOB_HANDLERS))}"
+        )
+    try:
+        job = await queue.enqueue(job_in.type, job_in.payload)
+        logger.info(f"Job {job['id']} ({job_in.type}) queued by admin {current_user['email']}")
+        return job
+    except Exception as e:
+        logger.error(f"Error enqueuing job: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to enqueue job"
+        )
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    queue: JobQueue = Depends(get_job_queue),
+    current_user: dict = Depends(require_admin),
+):
+    """
+    Get the status, progress and result of a background job.
+    **Admin only**
+    
+    Args:
+        job_id: Id returned when the job was enqueued
+        queue: JobQueue dependency
+        current_user: Current authenticated user (admin role required)
+    
+    Returns:
+        JobResponse with status, progress/total, attempts, result or error
+    
+    Raises:
+        HTTPException: If the job does not exist or has expired
+    """
+    job = await queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with id {job_id} not found"
+        )
+    return job
@@ -3,7 +3,7 @@ V1 API Router Aggregator
 Combines all versioned endpoints into a single router
 """
 from fastapi import APIRouter
-from app.api.endpoints import auth, items
+from app.api.endpoints import auth, items, jobs, health
 
 api_router = APIRouter()
 
@@ -20,3 +20,17 @@ api_router.include_router(
     prefix="/products",
     tags=["Products"],
 )
+
+# Include background job routes
+api_router.include_router(
+    jobs.router,
+    prefix="/jobs",
+    tags=["Jobs"],
+)
+
+# Include dependency health routes
+api_router.include_router(
+    health.router,
+    prefix="/health",
+    tags=["Health"],
+)
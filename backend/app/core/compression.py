@@ -0,0 +1,151 @@
+"""
+Response Compression
+Accept-Encoding negotiation and gzip/zstd compression of response bodies
+above a size threshold
+
+zstd is used when the optional `zstandard` package is installed and the
+client accepts it; gzip otherwise.
+"""
+import gzip
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.timing import span
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# Optional dependency; only imported once a client negotiates zstd
+ZSTD_AVAILABLE = find_spec("zstandard") is not None
+
+
+@lru_cache(maxsize=None)
+def zstd_compressor(level: int):
+    import zstandard
+    return zstandard.ZstdCompressor(level=level)
+
+
+def available_encodings() -> List[str]:
+    """Encodings the server may use, most preferred first."""
+    encodings = []
+    for encoding in settings.COMPRESSION_ENCODINGS:
+        if encoding == "zstd" and not ZSTD_AVAILABLE:
+            continue
+        if encoding in ("zstd", "gzip"):
+            encodings.append(encoding)
+    return encodings
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a response encoding from an Accept-Encoding header.
+
+    Among the encodings the client accepts (q > 0) the server's preference
+    wins; ``*`` matches any encoding not listed. Returns None when the
+    response should be sent uncompressed.
+    """
+    if not settings.COMPRESSION_ENABLED or not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstd_compressor(settings.COMPRESSION_ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def compress_body(body: bytes, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """
+    Compress ``body`` if an encoding was negotiated and it is at least
+    ``COMPRESSION_MIN_BYTES``; below that the header overhead and CPU cost
+    outweigh the savings.
+
+    Returns:
+        (payload, content_encoding); content_encoding is None if uncompressed
+    """
+    if encoding is None or len(body) < settings.COMPRESSION_MIN_BYTES:
+        return body, None
+    with span("compress"):
+        return compress(body, encoding), encoding
+
+
+class CompressionMiddleware:
+    """
+    Compresses complete (non-streaming) JSON and text responses.
+
+    Responses that already carry a Content-Encoding, such as list pages
+    served pre-compressed from the cache, are passed through untouched, as
+    are streaming responses like Server-Sent Events.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Hold the headers until we know whether the body is worth compressing
+                    start_message = message
+                return
+            if message["type"] == "http.response.body" and start_message is not None:
+                body = message.get("body", b"")
+                if message.get("more_body", False):
+                    # Streaming: send as-is
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                payload, content_encoding = compress_body(body, encoding)
+                headers = MutableHeaders(scope=start_message)
+                headers.add_vary_header("Accept-Encoding")
+                if content_encoding is not None:
+                    headers["Content-Encoding"] = content_encoding
+                    headers["Content-Length"] = str(len(payload))
+                    message = {**message, "body": payload}
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "EmmiDev API"
@@ -9,13 +9,79 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "CHANGE_THIS_TO_A_SECURE_SECRET_KEY"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
     
     # Database
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "emmi_db"
+    MONGODB_TIMEOUT_SECONDS: float = 2.0  # request-path reads and server selection
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
+    REDIS_TIMEOUT_SECONDS: float = 0.25  # request-path cache calls
+    
+    # Server (python -m app.server)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # 0 = one per available CPU
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30  # max wait for in-flight requests on shutdown
+    SERVER_READY_TIMEOUT_SECONDS: float = 60.0  # max wait for a replacement during a rolling restart
+    
+    # Request body limits (bytes); bulk endpoints such as job submission get the larger one
+    REQUEST_BODY_LIMIT_BYTES: int = 1_048_576
+    BULK_REQUEST_BODY_LIMIT_BYTES: int = 33_554_432
+    
+    # Response compression (zstd needs the optional zstandard package)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: List[str] = ["zstd", "gzip"]  # server preference order
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    
+    # Product list cache
+    CACHE_EXPIRATION_SECONDS: int = 300
+    STALE_CACHE_SECONDS: int = 86400  # how long pages stay servable while MongoDB is down
+    STALE_CACHE_MAX_PAGES: int = 1000  # cap on stale pages kept in Redis; oldest are evicted first
+    LOCAL_CACHE_MAX_ENTRIES: int = 256  # per-worker fallback copies of recent pages
+    
+    # Catalog replica: per-worker in-memory copy of the products collection
+    CATALOG_REPLICA_ENABLED: bool = False
+    CATALOG_REPLICA_POLL_SECONDS: float = 5.0  # updated_at / count check interval
+    
+    # Circuit breakers: consecutive failures before opening, seconds before probing again
+    BREAKER_FAILURE_THRESHOLD: int = 5
+    BREAKER_RESET_SECONDS: float = 10.0
+    
+    # Product change events (Server-Sent Events over Redis pub/sub)
+    PRODUCT_EVENTS_CHANNEL: str = "product_events"
+    PRODUCT_EVENTS_HISTORY: int = 1000
+    PRODUCT_EVENTS_CLIENT_QUEUE: int = 100
+    PRODUCT_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    PRODUCT_EVENTS_RETRY_MS: int = 3000
+    
+    # Background jobs
+    JOB_CONCURRENCY: int = 4
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 5.0
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 60.0
+    JOB_POLL_SECONDS: float = 5.0
+    JOB_RESULT_TTL_SECONDS: int = 86400
+    JOB_BATCH_SIZE: int = 500
+    EXPORT_DIR: str = "exports"
+    
+    # Request timing and profiling
+    SERVER_TIMING_ENABLED: bool = True
+    PROFILING_ENABLED: bool = False
+    PROFILE_SAMPLE_RATE: float = 0.0  # fraction of requests to sample (0-1)
+    PROFILE_SLOW_MS: float = 500.0  # keep sampled profiles of requests slower than this
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_DIR: str = "profiles"
+    
+    # Catalog statistics (upper bounds of the price histogram buckets)
+    STATS_PRICE_BUCKETS: List[float] = [10, 50, 100, 500, 1000]
+    
+    # Logging
+    LOG_DIR: str = "logs"
     
     # Environment
     ENVIRONMENT: str = "development"
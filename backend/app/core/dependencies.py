@@ -5,16 +5,22 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 from app.core.config import settings
+from app.core.resilience import UNAVAILABLE_ERRORS, mongo_breaker, record_fallback, redis_breaker
+from app.core.timing import span
 from app.db.mongodb import get_database
+from app.db.redis import get_redis
+from app.services.session_service import SessionService
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+import redis.asyncio as redis
 
 security = HTTPBearer()
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    redis_client: redis.Redis = Depends(get_redis),
 ):
     """
     Get current authenticated user from JWT token
@@ -22,6 +28,7 @@ async def get_current_user(
     Args:
         credentials: JWT token from Authorization header
         db: MongoDB database connection
+        redis_client: Redis connection for the session revocation check
     
     Returns:
         User document from database
@@ -31,27 +38,48 @@ async def get_current_user(
     """
     token = credentials.credentials
     
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
+    with span("auth"):
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            user_id: str = payload.get("sub")
+            if user_id is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid authentication credentials"
+                )
+        except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials"
             )
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
-        )
-    
-    try:
-        user = await db["users"].find_one({"_id": ObjectId(user_id)})
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid user ID in token"
-        )
+        
+        session_id = payload.get("sid")
+        if session_id:
+            try:
+                revoked = await redis_breaker.call(SessionService(redis_client).is_revoked(session_id))
+            except UNAVAILABLE_ERRORS:
+                # Fail open: access tokens are short-lived, and a Redis outage
+                # must not log everyone out
+                record_fallback("auth.revocation_check_skipped")
+                revoked = False
+            if revoked:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Session has been revoked"
+                )
+        
+        try:
+            user = await mongo_breaker.call(db["users"].find_one({"_id": ObjectId(user_id)}))
+        except UNAVAILABLE_ERRORS:
+            # MongoDB is down but the token signature checked out: let reads
+            # through (e.g. stale product pages) with no admin rights
+            record_fallback("auth.token_only")
+            user = {"_id": ObjectId(user_id), "email": None, "role": "user", "is_active": True}
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid user ID in token"
+            )
     
     if user is None:
         raise HTTPException(
@@ -0,0 +1,75 @@
+"""
+Request Size Limits
+Rejects request bodies over a configurable size with 413 before they are
+read into memory
+"""
+import json
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+TOO_LARGE = {"detail": "Request body too large"}
+
+
+class BodySizeLimitMiddleware:
+    """
+    ``max_bytes`` applies to every request; ``overrides`` maps path prefixes
+    to their own limit (e.g. a higher one for bulk endpoints), longest
+    prefix first.
+
+    A declared Content-Length over the limit is rejected without reading
+    the body. Chunked bodies are counted as they arrive and rejected once
+    they cross the limit.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int, overrides: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.overrides = sorted((overrides or {}).items(), key=lambda item: len(item[0]), reverse=True)
+
+    def limit_for(self, path: str) -> int:
+        for prefix, limit in self.overrides:
+            if path.startswith(prefix):
+                return limit
+        return self.max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limit_for(scope["path"])
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(send)
+            return
+
+        received = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Surfaces through FastAPI's body parsing as a 413 response
+                    raise HTTPException(status_code=413, detail=TOO_LARGE["detail"])
+            return message
+
+        await self.app(scope, receive_wrapper, send)
+
+    @staticmethod
+    async def _reject(send: Send) -> None:
+        body = json.dumps(TOO_LARGE).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -5,10 +5,10 @@ Sets up structured logging with proper formatters and handlers
 import logging
 import logging.config
 from pathlib import Path
+from app.core.config import settings
 
-# Log directory
-LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
+# Log directory, created by setup_logging() rather than on import
+LOG_DIR = Path(settings.LOG_DIR)
 
 LOGGING_CONFIG = {
     "version": 1,
@@ -63,6 +63,7 @@ LOGGING_CONFIG = {
 
 def setup_logging():
     """Initialize logging configuration."""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
     logging.config.dictConfig(LOGGING_CONFIG)
     logger = logging.getLogger("app")
     logger.info("Logging initialized")
@@ -0,0 +1,154 @@
+"""
+Resilience
+Per-dependency timeouts and circuit breakers so a slow or failing Redis or
+MongoDB degrades the API instead of stalling or failing every request
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Awaitable, Tuple, Type, TypeVar
+
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# How often each fallback path was taken, e.g. {"cache.local": 12}
+fallbacks: Counter = Counter()
+
+
+def record_fallback(name: str) -> None:
+    fallbacks[name] += 1
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed: calls go through; ``failure_threshold`` consecutive failures open
+    the circuit. Open: calls fail immediately with CircuitOpenError for
+    ``reset_timeout`` seconds. Half-open: one probe call is let through and
+    closes the circuit on success or reopens it on failure.
+
+    Only ``failure_types`` count as failures, so application errors (a
+    duplicate key, a bad ObjectId) don't trip the breaker. Timeouts always do.
+    """
+
+    def __init__(self, name: str, timeout: float, failure_types: Tuple[Type[BaseException], ...],
+                 failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.timeout = timeout
+        self.failure_types = failure_types + (asyncio.TimeoutError,)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.stats: Counter = Counter()
+
+    def _allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            return True
+        # Open, or half-open with the probe still in flight
+        return False
+
+    def _on_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info(f"Circuit {self.name} closed")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+
+    def _on_failure(self) -> None:
+        self.stats["failures"] += 1
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(f"Circuit {self.name} opened after {self.consecutive_failures} failures")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    async def call(self, awaitable: Awaitable[T]) -> T:
+        """
+        Await ``awaitable`` with the breaker's timeout.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (the awaitable is not run)
+            asyncio.TimeoutError: If the call took longer than the timeout
+        """
+        if not self._allow():
+            self.stats["short_circuited"] += 1
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        self.stats["calls"] += 1
+        try:
+            result = await asyncio.wait_for(awaitable, self.timeout)
+        except self.failure_types as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.stats["timeouts"] += 1
+            self._on_failure()
+            raise
+        except asyncio.CancelledError:
+            # Let the next call probe instead of leaving the slot taken
+            if self.state == HALF_OPEN:
+                self.state = OPEN
+                self.opened_at = 0.0
+            raise
+        except Exception:
+            # The dependency answered, just with an application error
+            self._on_success()
+            raise
+        self._on_success()
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "timeout_seconds": self.timeout,
+            **self.stats,
+        }
+
+
+redis_breaker = CircuitBreaker(
+    "redis",
+    timeout=settings.REDIS_TIMEOUT_SECONDS,
+    failure_types=(RedisError, OSError),
+    failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.BREAKER_RESET_SECONDS,
+)
+
+mongo_breaker = CircuitBreaker(
+    "mongodb",
+    timeout=settings.MONGODB_TIMEOUT_SECONDS,
+    failure_types=(ConnectionFailure, ExecutionTimeout),
+    failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.BREAKER_RESET_SECONDS,
+)
+
+# Errors a caller should treat as "dependency unavailable"
+UNAVAILABLE_ERRORS = (CircuitOpenError, asyncio.TimeoutError, RedisError, OSError, ConnectionFailure, ExecutionTimeout)
+
+
+def health_snapshot() -> dict:
+    breakers = {breaker.name: breaker.snapshot() for breaker in (redis_breaker, mongo_breaker)}
+    degraded = any(b["state"] != CLOSED for b in breakers.values())
+    return {
+        "status": "degraded" if degraded else "ok",
+        "breakers": breakers,
+        "fallbacks": dict(fallbacks),
+    }
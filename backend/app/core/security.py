@@ -1,27 +1,61 @@
+import hashlib
+import secrets
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from functools import lru_cache
+from typing import Optional, Tuple, Union, Any
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=None)
+def pwd_context():
+    # passlib and bcrypt are only needed by register and login, not by
+    # token-authenticated requests, so they are loaded on first use
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
-def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None,
+                        session_id: Optional[str] = None) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode = {"exp": expire, "sub": str(subject)}
+    if session_id:
+        to_encode["sid"] = session_id
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def create_refresh_token(session_id: str) -> str:
+    """
+    Create an opaque refresh token of the form ``<session_id>.<secret>``.
+    Only a hash of the token is stored server-side.
+    """
+    return f"{session_id}.{secrets.token_urlsafe(32)}"
+
+def parse_refresh_token(token: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a refresh token into its session id and hash.
+    
+    Returns:
+        (session_id, token_hash), or None if the token is malformed
+    """
+    session_id, _, secret = token.partition(".")
+    if not session_id or not secret:
+        return None
+    return session_id, hash_token(token)
+
+def hash_token(token: str) -> str:
+    # Refresh tokens are high-entropy random strings, so a fast hash is
+    # enough; bcrypt would throw away the CPU saved by not logging in.
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def decode_token(token: str) -> dict:
     """
     Decode and verify JWT token
@@ -0,0 +1,108 @@
+"""
+Request Timing
+Per-request timing spans (auth, cache, db, serialize) reported in a
+Server-Timing response header and the access log, plus opt-in sampling
+profiles of slow requests
+"""
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+access_logger = logging.getLogger("app.access")
+
+_request_spans: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_spans", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """
+    Time a phase of the current request. Repeated spans with the same name
+    are summed. Does nothing outside a request.
+    """
+    spans = _request_spans.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if spans is not None:
+            spans.append((name, (time.perf_counter() - start) * 1000))
+
+
+def _summarize(spans: List[Tuple[str, float]]) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for name, duration in spans:
+        totals[name] = totals.get(name, 0.0) + duration
+    return totals
+
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware so spans recorded by dependencies and endpoints
+    share the request's context and streaming responses are not buffered.
+
+    ``app`` is the time until the response headers were sent; ``total``
+    (access log only) also includes sending the body.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def _profile_requested(scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                return value in (b"1", b"true")
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans: List[Tuple[str, float]] = []
+        token = _request_spans.set(spans)
+        start = time.perf_counter()
+        status_code = 500
+        profiler = None
+        forced = False
+        if settings.PROFILING_ENABLED:
+            forced = self._profile_requested(scope)
+            if forced or random.random() < settings.PROFILE_SAMPLE_RATE:
+                from app.core.profiling import SamplingProfiler
+                profiler = SamplingProfiler.acquire()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    totals = _summarize(spans)
+                    totals["app"] = (time.perf_counter() - start) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        ", ".join(f"{name};dur={duration:.1f}" for name, duration in totals.items()),
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            total = (time.perf_counter() - start) * 1000
+            _request_spans.reset(token)
+            phases = " ".join(f"{name}={duration:.1f}ms" for name, duration in _summarize(spans).items())
+            access_logger.info(f"{scope['method']} {scope['path']} {status_code} {total:.1f}ms {phases}".rstrip())
+            if profiler is not None:
+                profiler.stop()
+                # Requested profiles are always kept, sampled ones only when slow
+                if forced or total >= settings.PROFILE_SLOW_MS:
+                    path = profiler.save(scope["method"], scope["path"], total)
+                    access_logger.info(f"Saved profile for {scope['method']} {scope['path']} to {path}")
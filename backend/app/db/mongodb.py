@@ -5,7 +5,13 @@ class Database:
     client: AsyncIOMotorClient = None
 
     def connect(self):
-        self.client = AsyncIOMotorClient(settings.MONGODB_URL)
+        # Fail fast when no server is reachable instead of the 30s driver default
+        timeout_ms = int(settings.MONGODB_TIMEOUT_SECONDS * 1000)
+        self.client = AsyncIOMotorClient(
+            settings.MONGODB_URL,
+            serverSelectionTimeoutMS=timeout_ms,
+            connectTimeoutMS=timeout_ms,
+        )
 
     def close(self):
         self.client.close()
@@ -1,13 +1,34 @@
 import redis.asyncio as redis
 from app.core.config import settings
 
+class RedisClient:
+    client: redis.Redis = None
+    # Returns bytes as stored, for payloads written straight to the response
+    binary: redis.Redis = None
+
+    def connect(self):
+        # No socket_timeout: pub/sub and the job queue block on reads by design.
+        # Request-path calls are bounded by the Redis circuit breaker instead.
+        options = {"socket_connect_timeout": settings.REDIS_TIMEOUT_SECONDS * 4}
+        self.client = redis.Redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True, **options)
+        self.binary = redis.Redis.from_url(settings.REDIS_URL, **options)
+
+    async def close(self):
+        await self.client.aclose()
+        await self.binary.aclose()
+
+redis_db = RedisClient()
+
 async def get_redis():
     """
-    Dependency to get a Redis connection.
+    Dependency to get the process-wide Redis client.
+    The client owns a connection pool; callers must not close it.
+    """
+    return redis_db.client
+
+async def get_redis_binary():
+    """
+    Dependency to get the process-wide Redis client that does not decode
+    responses, for cached payloads that are served as raw bytes.
     """
-    pool = redis.ConnectionPool.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
-    client = redis.Redis(connection_pool=pool)
-    try:
-        yield client
-    finally:
-        await client.close()
\ No newline at end of file
+    return redis_db.binary
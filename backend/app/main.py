@@ -4,26 +4,57 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.limits import BodySizeLimitMiddleware
 from app.core.logging import setup_logging
-from app.db.mongodb import db
+from app.core.timing import TimingMiddleware
+from app.db.mongodb import db, get_database
+from app.db.redis import redis_db
+from app.services.catalog_replica import catalog_replica
+from app.services.events import product_events
 from app.api.v1.api import api_router
 
-# Logging Setup
-logger = setup_logging()
+logger = logging.getLogger("app")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    # Logging is configured here rather than at import, so importing the
+    # app (tests, tooling, the import-time check) has no side effects
+    setup_logging()
     logger.info("Connecting to MongoDB...")
     db.connect()
+    logger.info("Connecting to Redis...")
+    redis_db.connect()
+    await product_events.start(redis_db.client)
+    if settings.CATALOG_REPLICA_ENABLED:
+        logger.info("Loading catalog replica...")
+        await catalog_replica.start(get_database(), product_events)
     yield
     # Shutdown
+    await catalog_replica.stop()
+    await product_events.stop()
+    logger.info("Closing Redis connection...")
+    await redis_db.close()
     logger.info("Closing MongoDB connection...")
     db.close()
 
 app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
-# Add CORS middleware for frontend communication
+app.add_middleware(CompressionMiddleware)
+
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.REQUEST_BODY_LIMIT_BYTES,
+    overrides={f"{settings.API_V1_STR}/jobs": settings.BULK_REQUEST_BODY_LIMIT_BYTES},
+)
+
+# Server-Timing covers everything below it
+app.add_middleware(TimingMiddleware)
+
+# Add CORS middleware for frontend communication. Added last so it is the
+# outermost layer and responses the other middleware produce on their own
+# (e.g. 413 for an oversized body) still carry the CORS headers.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://localhost:3000"],  # Vite default ports
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import Any, Optional
+from datetime import datetime
+
+class JobCreate(BaseModel):
+    """Schema for enqueuing a background job."""
+    type: str = Field(..., description="Job type, e.g. stats.recompute or products.export")
+    payload: dict = Field(default_factory=dict)
+
+class JobResponse(BaseModel):
+    """Schema for returning job status and progress."""
+    id: str
+    type: str
+    status: str
+    progress: int = 0
+    total: int = 0
+    attempts: int = 0
+    max_attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class PriceBucket(BaseModel):
+    """Histogram bucket covering prices in [min, max); open-ended when a bound is None."""
+    min: Optional[float] = None
+    max: Optional[float] = None
+    count: int
+
+class CategoryStats(BaseModel):
+    """Aggregated statistics for a single product category."""
+    category: str
+    count: int
+    min_price: float
+    max_price: float
+    avg_price: float
+    histogram: List[PriceBucket]
+    updated_at: Optional[datetime] = None
+
+class CatalogStats(BaseModel):
+    """Per-category statistics for the whole catalog."""
+    total_products: int
+    categories: List[CategoryStats]
@@ -19,4 +19,14 @@ class UserResponse(BaseModel):
     is_active: bool
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TokenResponse(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int = Field(..., description="Access token lifetime in seconds")
+    user_id: str
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
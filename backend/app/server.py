@@ -0,0 +1,116 @@
+"""
+Production Server
+Runs the API in several uvicorn worker processes sharing one listening
+socket, with graceful drain on SIGTERM and zero-downtime rolling restarts
+
+Each worker is a fresh interpreter that imports the app and opens its own
+MongoDB and Redis clients in the lifespan; the parent only binds the socket
+and supervises, so no client or connection pool is ever shared across a fork.
+
+Usage (from the backend directory):
+    python -m app.server [--workers N] [--host 0.0.0.0] [--port 8000]
+
+Signals (to the parent process):
+    SIGTERM / SIGINT  stop accepting connections, drain in-flight requests, exit
+    SIGHUP            rolling restart: each worker is replaced only after its
+                      successor is serving
+    SIGTTIN / SIGTTOU add / remove a worker
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+from typing import List, Optional
+
+import uvicorn
+from uvicorn.supervisors.multiprocess import Multiprocess, Process
+
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+APP = "app.main:app"
+
+
+def default_workers() -> int:
+    """CPUs this process may run on, which can be fewer than the machine has (containers, taskset)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class WorkerServer(uvicorn.Server):
+    """
+    uvicorn server for one worker.
+
+    Signals ``ready`` once the lifespan has run and the socket is being
+    served, so the supervisor knows when a replacement can take over.
+    """
+
+    def __init__(self, config: uvicorn.Config, ready=None):
+        super().__init__(config)
+        self.ready = ready
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets)
+        if self.ready is not None and self.started:
+            self.ready.set()
+
+    async def shutdown(self, sockets=None) -> None:
+        # Event streams never finish on their own and would hold the drain
+        # open until the timeout; end them first so clients reconnect (with
+        # Last-Event-ID) to another worker.
+        from app.services.events import product_events
+        await product_events.stop()
+        await super().shutdown(sockets)
+
+
+class WorkerSupervisor(Multiprocess):
+    """uvicorn's process supervisor with restarts that start the replacement first."""
+
+    def restart_all(self) -> None:
+        ready_timeout = settings.SERVER_READY_TIMEOUT_SECONDS
+        for idx, old in enumerate(list(self.processes)):
+            ready = multiprocessing.get_context("spawn").Event()
+            new = Process(self.config, WorkerServer(self.config, ready=ready).run, self.sockets)
+            new.start()
+            if not ready.wait(ready_timeout):
+                logger.error(f"Worker [{new.pid}] not ready after {ready_timeout}s, keeping [{old.pid}]")
+                new.terminate()
+                new.join()
+                continue
+            # Both share the listening socket, so there is no moment without a
+            # worker accepting; the old one finishes its in-flight requests.
+            old.terminate()
+            old.join()
+            self.processes[idx] = new
+        logger.info("Rolling restart finished")
+
+
+def build_config(host: str, port: int, workers: int) -> uvicorn.Config:
+    return uvicorn.Config(
+        APP,
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        proxy_headers=True,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the API with multiple worker processes.")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS or default_workers(),
+                        help="worker processes (default: SERVER_WORKERS, or the CPU count)")
+    args = parser.parse_args(argv)
+
+    config = build_config(args.host, args.port, args.workers)
+    # Bound once in the parent and inherited by every worker
+    sock = config.bind_socket()
+    WorkerSupervisor(config, target=WorkerServer(config).run, sockets=[sock]).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Catalog Replica
+Per-worker in-memory copy of the products collection, kept current from the
+product change events and an `updated_at` high-water mark, so product reads
+and filtered listings are served without a network round trip
+"""
+import asyncio
+import logging
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.services.events import ProductEventBroker, Subscriber
+
+logger = logging.getLogger(__name__)
+
+REPLICA_PROJECTION = {"name": 1, "price": 1, "category": 1, "updated_at": 1}
+
+
+class CatalogReplica:
+    """
+    Column-oriented snapshot of the catalog, sorted by ``_id``.
+
+    Each field is a separate array indexed by position, ids are ObjectId hex
+    strings (which sort in ObjectId order) and category strings are interned,
+    so a product costs a few pointers rather than a dict. Two secondary
+    indexes serve filtered queries: ids per category and (price, id) pairs.
+    Results are always in ``_id`` order, the same order MongoDB returns.
+
+    Writes made through this worker are applied immediately; writes from
+    other workers arrive as product change events. A periodic poll of
+    ``updated_at`` and the document count repairs anything both missed
+    (writes outside the API, a dropped subscription), and ``staleness()``
+    is the time since that last succeeded.
+    """
+
+    def __init__(self):
+        self.collection = None
+        self.events: Optional[ProductEventBroker] = None
+        self.ready = False
+        self._clear()
+        self.high_water: Optional[datetime] = None
+        self.synced_at = 0.0
+        self.last_event_id: Optional[int] = None
+        self.reloads = 0
+        self._subscriber: Optional[Subscriber] = None
+        self._missing: set = set()
+        self._skipped = 0  # documents without a valid name, price and category
+        self._count_mismatches = 0
+        self._reload_pending = False
+        self._tasks: List[asyncio.Task] = []
+
+    def _clear(self) -> None:
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.prices = array("d")
+        self.categories: List[str] = []
+        self.by_category: Dict[str, List[str]] = {}
+        self.by_price: List[Tuple[float, str]] = []
+
+    # Lifecycle
+
+    async def start(self, db: AsyncIOMotorDatabase, events: ProductEventBroker) -> None:
+        """Load the catalog and start following changes."""
+        self.collection = db["products"]
+        self.events = events
+        # Subscribe before loading so changes made during the load are queued
+        self._subscriber = events.subscribe()
+        # If MongoDB is down at startup, requests use the normal path until a poll loads the replica
+        await self._reload_quietly()
+        self._tasks = [
+            asyncio.create_task(self._follow_events()),
+            asyncio.create_task(self._poll()),
+        ]
+
+    async def stop(self) -> None:
+        self.ready = False
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        if self._subscriber is not None:
+            self.events.unsubscribe(self._subscriber)
+            self._subscriber = None
+
+    async def reload(self) -> None:
+        """Replace the snapshot with a full read of the collection."""
+        started = time.monotonic()
+        docs = await self.collection.find({}, REPLICA_PROJECTION).sort("_id", 1).to_list(length=None)
+
+        # Build next to the live snapshot and swap, so reads never see a partial load
+        ids, names, prices, categories = [], [], array("d"), []
+        by_category: Dict[str, List[str]] = {}
+        high_water = None
+        skipped = 0
+        for doc in docs:
+            if not self._valid(doc):
+                skipped += 1
+                continue
+            product_id = str(doc["_id"])
+            category = sys.intern(doc["category"])
+            ids.append(product_id)
+            names.append(doc["name"])
+            prices.append(doc["price"])
+            categories.append(category)
+            by_category.setdefault(category, []).append(product_id)
+            if doc.get("updated_at") and (high_water is None or doc["updated_at"] > high_water):
+                high_water = doc["updated_at"]
+
+        self.ids, self.names, self.prices, self.categories = ids, names, prices, categories
+        self.by_category = by_category
+        self.by_price = sorted(zip(prices, ids))
+        self.high_water = high_water
+        self.synced_at = started
+        self._skipped = skipped
+        self._missing.clear()
+        self._reload_pending = False
+        self.reloads += 1
+        self.ready = True
+        logger.info(f"Catalog replica loaded {len(ids)} products in {time.monotonic() - started:.3f}s")
+
+    # Reads
+
+    def staleness(self) -> float:
+        """Seconds since the replica was last confirmed in sync with MongoDB."""
+        return time.monotonic() - self.synced_at
+
+    def get(self, product_id: str) -> Optional[dict]:
+        position = self._position(product_id)
+        return None if position is None else self._product(position)
+
+    def query(self, skip: int = 0, limit: int = 10, category: Optional[str] = None,
+              min_price: Optional[float] = None, max_price: Optional[float] = None) -> List[dict]:
+        """Page of products matching the filters, in ``_id`` order."""
+        if category is None and min_price is None and max_price is None:
+            return [self._product(i) for i in range(skip, min(skip + limit, len(self.ids)))]
+
+        category_ids = self.by_category.get(category, []) if category is not None else None
+        if category_ids is not None and min_price is None and max_price is None:
+            return [self._product(self._position(pid)) for pid in category_ids[skip:skip + limit]]
+
+        lo, hi = self._price_bounds(min_price, max_price)
+        width = hi - lo
+        if width == 0 or category_ids == []:
+            return []
+        # Expected matches if price and category are independent, and so how
+        # far a walk in id order must go to fill the page
+        expected = width if category_ids is None else width * len(category_ids) / len(self.ids)
+        walk = (skip + limit) * len(self.ids) / max(expected, 1)
+        if walk <= width:
+            # Wide price range: walk the catalog in id order, stop once the page is full
+            return self._first_matches(range(len(self.ids)), skip, limit, category, min_price, max_price)
+        if category_ids is not None and len(category_ids) <= width:
+            return self._first_matches((self._position(pid) for pid in category_ids),
+                                       skip, limit, category, min_price, max_price)
+        # Narrow price range: sort the few ids in it
+        if category_ids is None:
+            matches = sorted(pid for _, pid in self.by_price[lo:hi])
+        else:
+            matches = sorted(pid for _, pid in self.by_price[lo:hi]
+                             if self.categories[self._position(pid)] == category)
+        return [self._product(self._position(pid)) for pid in matches[skip:skip + limit]]
+
+    def snapshot(self) -> dict:
+        return {
+            "ready": self.ready,
+            "products": len(self.ids),
+            "categories": len(self.by_category),
+            "staleness_seconds": round(self.staleness(), 3) if self.ready else None,
+            "last_event_id": self.last_event_id,
+            "reloads": self.reloads,
+        }
+
+    def _position(self, product_id: str) -> Optional[int]:
+        position = bisect_left(self.ids, product_id)
+        if position < len(self.ids) and self.ids[position] == product_id:
+            return position
+        return None
+
+    def _product(self, position: int) -> dict:
+        return {
+            "_id": self.ids[position],
+            "name": self.names[position],
+            "price": self.prices[position],
+            "category": self.categories[position],
+        }
+
+    def _price_bounds(self, min_price: Optional[float], max_price: Optional[float]) -> Tuple[int, int]:
+        """Slice of ``by_price`` with min_price <= price <= max_price."""
+        lo = 0 if min_price is None else bisect_left(self.by_price, (min_price, ""))
+        # Ids are hex, so "~" sorts after every id with the same price
+        hi = len(self.by_price) if max_price is None else bisect_right(self.by_price, (max_price, "~"))
+        return lo, hi
+
+    def _first_matches(self, positions: Iterable[int], skip: int, limit: int, category: Optional[str],
+                       min_price: Optional[float], max_price: Optional[float]) -> List[dict]:
+        """Page of matching products from ``positions`` (in id order), stopping once it is full."""
+        page = []
+        for position in positions:
+            if category is not None and self.categories[position] != category:
+                continue
+            if not self._in_price_range(self.prices[position], min_price, max_price):
+                continue
+            if skip:
+                skip -= 1
+                continue
+            page.append(self._product(position))
+            if len(page) == limit:
+                break
+        return page
+
+    @staticmethod
+    def _in_price_range(price: float, min_price: Optional[float], max_price: Optional[float]) -> bool:
+        return (min_price is None or price >= min_price) and (max_price is None or price <= max_price)
+
+    @staticmethod
+    def _valid(doc: dict) -> bool:
+        return (isinstance(doc.get("name"), str) and isinstance(doc.get("category"), str)
+                and isinstance(doc.get("price"), (int, float)))
+
+    # Writes
+
+    def apply(self, op: str, product_id: Optional[str], fields: Optional[dict] = None) -> None:
+        """Apply a product change event. Replaying an event is harmless."""
+        if op == "delete":
+            self._remove(product_id)
+        elif op in ("create", "update"):
+            position = self._position(product_id)
+            if position is not None:
+                product = {**self._product(position), **(fields or {})}
+            elif op == "create":
+                product = {"_id": product_id, **(fields or {})}
+            else:
+                # Update for a product we don't have yet: fetch it on the next poll
+                self._missing.add(product_id)
+                return
+            if self._valid(product):
+                self._upsert(product)
+
+    def _upsert(self, product: dict) -> None:
+        product_id = str(product["_id"])
+        self._remove(product_id)
+        position = bisect_left(self.ids, product_id)
+        category = sys.intern(product["category"])
+        self.ids.insert(position, product_id)
+        self.names.insert(position, product["name"])
+        self.prices.insert(position, product["price"])
+        self.categories.insert(position, category)
+        insort(self.by_category.setdefault(category, []), product_id)
+        insort(self.by_price, (self.prices[position], product_id))
+
+    def _remove(self, product_id: str) -> None:
+        position = self._position(product_id)
+        if position is None:
+            return
+        category, price = self.categories[position], self.prices[position]
+        for column in (self.ids, self.names, self.prices, self.categories):
+            del column[position]
+        category_ids = self.by_category[category]
+        del category_ids[bisect_left(category_ids, product_id)]
+        if not category_ids:
+            del self.by_category[category]
+        del self.by_price[bisect_left(self.by_price, (price, product_id))]
+
+    # Sync
+
+    async def _follow_events(self) -> None:
+        while True:
+            subscriber = self._subscriber
+            if subscriber.dropped and subscriber.queue.empty():
+                # Fell behind the event stream; start over from a full load
+                logger.warning("Catalog replica fell behind product events, reloading")
+                self.events.unsubscribe(subscriber)
+                self._subscriber = self.events.subscribe()
+                await self._reload_quietly()
+                continue
+            event = await subscriber.queue.get()
+            if event is None:
+                # Broker is shutting down
+                return
+            if event.get("id") is not None:
+                self.last_event_id = event["id"]
+            if event["op"] == "reset":
+                await self._reload_quietly()
+            else:
+                self.apply(event["op"], event.get("product_id"), event.get("fields"))
+
+    async def _reload_quietly(self) -> None:
+        try:
+            await self.reload()
+        except Exception as e:
+            # Keep serving the previous snapshot; the next poll retries
+            logger.error(f"Catalog replica reload failed: {str(e)}")
+            self._reload_pending = True
+
+    async def _poll(self) -> None:
+        interval = settings.CATALOG_REPLICA_POLL_SECONDS
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._sync(interval)
+            except Exception as e:
+                logger.error(f"Catalog replica sync failed: {str(e)}")
+
+    async def _sync(self, interval: float) -> None:
+        if self._reload_pending:
+            self._request_reload()
+            return
+        started = time.monotonic()
+        if self.high_water is not None:
+            # Overlap by one interval: writers' clocks may lag ours and
+            # re-applying an unchanged product is harmless
+            query = {"updated_at": {"$gte": self.high_water - timedelta(seconds=interval)}}
+        else:
+            # Nothing loaded had updated_at yet
+            query = {"updated_at": {"$exists": True}}
+        if self._missing:
+            missing = [ObjectId(pid) for pid in self._missing if ObjectId.is_valid(pid)]
+            query = {"$or": [query, {"_id": {"$in": missing}}]}
+        async for doc in self.collection.find(query, REPLICA_PROJECTION):
+            if self._valid(doc):
+                self._upsert(doc)
+            if doc.get("updated_at") and (self.high_water is None or doc["updated_at"] > self.high_water):
+                self.high_water = doc["updated_at"]
+        self._missing.clear()
+
+        # Deletes and writes without updated_at (e.g. made from the shell)
+        # only show up in the count. Reload if it stays off for two polls,
+        # so events still in flight don't trigger one.
+        count = await self.collection.count_documents({})
+        expected = len(self.ids) + self._skipped
+        self._count_mismatches = self._count_mismatches + 1 if count != expected else 0
+        if self._count_mismatches >= 2:
+            logger.warning(f"Catalog replica has {expected} products, MongoDB {count}; reloading")
+            self._request_reload()
+            self._count_mismatches = 0
+        self.synced_at = started
+
+    def _request_reload(self) -> None:
+        # Reloads run in the event follower so queued events apply after the swap
+        self._subscriber.offer({"id": None, "op": "reset"})
+
+
+catalog_replica = CatalogReplica()
@@ -0,0 +1,170 @@
+"""
+Product Change Events
+Publishes compact product change events to a Redis pub/sub channel and fans
+them out to the Server-Sent Events clients connected to this worker
+"""
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Optional, Set
+import redis.asyncio as redis
+from app.core.config import settings
+from app.core.resilience import redis_breaker
+
+logger = logging.getLogger(__name__)
+
+EVENT_SEQUENCE_KEY = "product_events:seq"
+
+
+class Subscriber:
+    """A single connected client with a bounded queue of pending events."""
+
+    def __init__(self, max_queue: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = False
+
+    def offer(self, event: Optional[dict]) -> bool:
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.dropped = True
+            return False
+
+
+class ProductEventBroker:
+    """
+    One Redis subscription per worker, fanned out to every local subscriber.
+
+    Event ids come from a Redis counter so they are ordered across workers;
+    the last ``PRODUCT_EVENTS_HISTORY`` events are kept in memory so clients
+    reconnecting with ``Last-Event-ID`` can resume without a gap.
+
+    ``covered_from`` is the first id this worker is sure to have received:
+    the sequence value read just after its subscription was established.
+    Events before it were never seen here, so a client resuming from an
+    earlier id (e.g. one moved over from a draining worker) gets a
+    ``reset`` instead of a silent gap.
+    """
+
+    def __init__(self):
+        self.redis: Optional[redis.Redis] = None
+        self.channel = settings.PRODUCT_EVENTS_CHANNEL
+        self.history: deque = deque(maxlen=settings.PRODUCT_EVENTS_HISTORY)
+        self.subscribers: Set[Subscriber] = set()
+        self.closed = False
+        self.covered_from: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, op: str, product_id: Optional[str] = None, fields: Optional[dict] = None) -> None:
+        """
+        Publish a change event; ``op`` is one of create, update, delete, or
+        reset after bulk changes that clients should handle by refetching.
+        """
+        if self.redis is None:
+            return
+        event_id = await redis_breaker.call(self.redis.incr(EVENT_SEQUENCE_KEY))
+        event = {"id": event_id, "op": op, "product_id": product_id, "fields": fields or {}}
+        await redis_breaker.call(self.redis.publish(self.channel, json.dumps(event, default=str)))
+
+    async def start(self, redis_client: redis.Redis, listen: bool = True) -> None:
+        """Attach to Redis; ``listen=False`` only publishes (e.g. in the job worker)."""
+        self.redis = redis_client
+        self.closed = False
+        self.covered_from = None
+        if listen:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """End every stream; safe to call more than once."""
+        self.closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Wake every stream so it can finish and let the server drain
+        for subscriber in list(self.subscribers):
+            subscriber.dropped = True
+            subscriber.offer(None)
+        self.subscribers.clear()
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Anything published while unsubscribed is lost, so the buffer
+                # only vouches for ids after the sequence as of now
+                sequence = int(await self.redis.get(EVENT_SEQUENCE_KEY) or 0)
+                self.history.clear()
+                self.covered_from = sequence + 1
+                logger.info(f"Subscribed to {self.channel}")
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._dispatch(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Product event subscription failed, retrying: {str(e)}")
+                await asyncio.sleep(1)
+            finally:
+                self.covered_from = None
+                await pubsub.aclose()
+
+    def _dispatch(self, event: dict) -> None:
+        self.history.append(event)
+        for subscriber in list(self.subscribers):
+            if not subscriber.offer(event):
+                # Slow consumer: stop feeding it. The stream ends once its
+                # queue drains and the client resumes via Last-Event-ID.
+                logger.warning("Dropping slow product event subscriber")
+                self.subscribers.discard(subscriber)
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscriber:
+        """
+        Register a new subscriber, replaying buffered events after ``last_event_id``.
+
+        If the buffer can't show it holds every event after the requested
+        id (it starts later, or the worker isn't subscribed yet), a ``reset``
+        event is queued instead so the client knows to refetch the product
+        list.
+        """
+        subscriber = Subscriber(settings.PRODUCT_EVENTS_CLIENT_QUEUE)
+        if self.closed:
+            # Shutting down: end the stream at once, the client reconnects elsewhere
+            subscriber.dropped = True
+            subscriber.offer(None)
+            return subscriber
+        if last_event_id is not None:
+            if not self._covers(last_event_id + 1):
+                if self.history:
+                    latest = self.history[-1]["id"]
+                else:
+                    latest = (self.covered_from or last_event_id + 1) - 1
+                subscriber.offer({"id": latest, "op": "reset"})
+            else:
+                for event in self.history:
+                    if event["id"] > last_event_id and not subscriber.offer(event):
+                        break
+        if not subscriber.dropped:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def _covers(self, event_id: int) -> bool:
+        """Whether every event from ``event_id`` on is buffered or yet to arrive."""
+        if self.covered_from is None:
+            return False
+        if self.history and len(self.history) == self.history.maxlen:
+            # Full buffer: older events have been evicted
+            return event_id >= self.history[0]["id"]
+        return event_id >= self.covered_from
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+
+product_events = ProductEventBroker()
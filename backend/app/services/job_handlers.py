@@ -0,0 +1,156 @@
+"""
+Background Job Handlers
+Catalog work that runs in the job worker instead of a request handler
+"""
+import asyncio
+import calendar
+import hashlib
+import json
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+from bson import ObjectId
+from pydantic import ValidationError
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
+from app.db.redis import redis_db
+from app.schemas.product import ProductCreate
+from app.services.job_service import JobQueue
+from app.services.product_cache import ProductPageCache
+from app.services.product_service import ProductService
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job cannot succeed."""
+
+
+class JobContext:
+    """What a handler gets to work with: its job record, the catalog service and progress reporting."""
+
+    def __init__(self, job: dict, queue: JobQueue, service: ProductService):
+        self.job = job
+        self.queue = queue
+        self.service = service
+
+    async def progress(self, done: int, total: Optional[int] = None) -> None:
+        await self.queue.set_progress(self.job["id"], done, total)
+
+
+JobHandler = Callable[[JobContext, dict], Awaitable[dict]]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(job_type: str):
+    """Register a coroutine as the handler for ``job_type``."""
+    def register(func: JobHandler) -> JobHandler:
+        JOB_HANDLERS[job_type] = func
+        return func
+    return register
+
+
+@job_handler("stats.recompute")
+async def recompute_stats(ctx: JobContext, payload: dict) -> dict:
+    categories = await ctx.service.stats.recompute_all()
+    return {"categories": categories}
+
+
+@job_handler("products.export")
+async def export_products(ctx: JobContext, payload: dict) -> dict:
+    """Write the whole catalog as JSON lines to ``EXPORT_DIR``."""
+    collection = ctx.service.collection
+    total = await collection.count_documents({})
+    await ctx.progress(0, total)
+
+    export_dir = Path(settings.EXPORT_DIR)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    path = export_dir / f"products-{ctx.job['id']}.jsonl"
+
+    exported = 0
+    with path.open("w", encoding="utf-8") as f:
+        cursor = collection.find().batch_size(settings.JOB_BATCH_SIZE)
+        batch = []
+        async for product in cursor:
+            batch.append(json.dumps({**product, "_id": str(product["_id"])}, default=str))
+            if len(batch) >= settings.JOB_BATCH_SIZE:
+                await asyncio.to_thread(f.write, "\n".join(batch) + "\n")
+                exported += len(batch)
+                batch = []
+                await ctx.progress(exported)
+        if batch:
+            await asyncio.to_thread(f.write, "\n".join(batch) + "\n")
+            exported += len(batch)
+    await ctx.progress(exported, total)
+    return {"path": str(path), "count": exported}
+
+
+def import_id(job: dict, position: int) -> ObjectId:
+    """
+    Deterministic ``_id`` for the product at ``position`` in an import job.
+
+    Laid out like an ObjectId (job creation time, then a hash of the job id,
+    then the position), so imported products sort after older ones and in
+    payload order, and a retried batch maps onto the documents it already
+    inserted.
+    """
+    created = calendar.timegm(datetime.fromisoformat(job["created_at"]).utctimetuple())
+    job_hash = hashlib.blake2b(job["id"].encode(), digest_size=4).digest()
+    return ObjectId(struct.pack(">I", created) + job_hash + struct.pack(">I", position))
+
+
+async def insert_new(collection, documents: List[dict]) -> None:
+    """Insert documents, skipping any whose ``_id`` already exists."""
+    try:
+        await collection.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        # 11000: duplicate key
+        if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+            raise
+
+
+@job_handler("products.import")
+async def import_products(ctx: JobContext, payload: dict) -> dict:
+    """
+    Bulk insert ``payload["products"]`` in batches.
+
+    Retries resume from the recorded progress. Each product's ``_id`` is
+    derived from the job and its position, so a batch that was inserted
+    before the worker crashed or failed to record progress is not inserted
+    twice when it is retried. Statistics are recomputed once at the end and SSE
+    clients get a single reset event instead of one event per product.
+    """
+    try:
+        products = [ProductCreate(**p).model_dump() for p in payload.get("products", [])]
+    except (TypeError, ValidationError) as e:
+        raise PermanentJobError(f"Invalid products payload: {str(e)}")
+    now = datetime.utcnow()
+    for position, product in enumerate(products):
+        product["_id"] = import_id(ctx.job, position)
+        product["updated_at"] = now
+
+    total = len(products)
+    done = ctx.job["progress"]
+    await ctx.progress(done, total)
+    for start in range(done, total, settings.JOB_BATCH_SIZE):
+        batch = products[start:start + settings.JOB_BATCH_SIZE]
+        await insert_new(ctx.service.collection, batch)
+        done = start + len(batch)
+        await ctx.progress(done)
+
+    categories = await ctx.service.stats.recompute_all()
+    await ProductPageCache(redis_db.binary).invalidate()
+    if ctx.service.events is not None:
+        await ctx.service.events.publish("reset")
+    return {"imported": total, "categories": categories}
+
+
+@job_handler("products.build_indexes")
+async def build_indexes(ctx: JobContext, payload: dict) -> dict:
+    """Create the indexes used by category and price queries."""
+    names = await ctx.service.collection.create_indexes([
+        IndexModel([("category", ASCENDING), ("price", ASCENDING)]),
+        IndexModel([("price", ASCENDING)]),
+    ])
+    return {"indexes": names}
@@ -0,0 +1,173 @@
+"""
+Background Job Queue
+Redis-backed queue for long-running catalog work (exports, imports, index
+builds, stats recomputes) so request handlers only enqueue and return a job id
+"""
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional
+import redis.asyncio as redis
+from app.core.config import settings
+
+QUEUE_KEY = "jobs:queue"
+PROCESSING_KEY = "jobs:processing"
+DELAYED_KEY = "jobs:delayed"
+JOB_KEY = "job:{}"
+
+# Job lifecycle: queued -> running -> succeeded | retrying -> ... | failed
+QUEUED = "queued"
+RUNNING = "running"
+RETRYING = "retrying"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Moves due delayed jobs back onto the queue atomically so two workers
+# can't both promote the same retry.
+PROMOTE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for _, job_id in ipairs(due) do
+    redis.call('ZREM', KEYS[1], job_id)
+    redis.call('LPUSH', KEYS[2], job_id)
+end
+return #due
+"""
+
+JSON_FIELDS = ("payload", "result")
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+class JobQueue:
+    """
+    Jobs are stored as Redis hashes (``job:<id>``); their ids move between a
+    pending list, a processing list and a delayed sorted set used for retry
+    backoff. Workers refresh ``heartbeat_at`` while a job runs so jobs left
+    behind by a crashed worker can be requeued.
+    """
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+
+    async def enqueue(self, job_type: str, payload: Optional[dict] = None,
+                      max_attempts: Optional[int] = None) -> dict:
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "type": job_type,
+            "status": QUEUED,
+            "payload": json.dumps(payload or {}, default=str),
+            "progress": 0,
+            "total": 0,
+            "attempts": 0,
+            "max_attempts": max_attempts or settings.JOB_MAX_ATTEMPTS,
+            "created_at": _now(),
+        }
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(JOB_KEY.format(job_id), mapping=job)
+            pipe.lpush(QUEUE_KEY, job_id)
+            await pipe.execute()
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        job = await self.redis.hgetall(JOB_KEY.format(job_id))
+        if not job:
+            return None
+        for field in JSON_FIELDS:
+            if field in job:
+                job[field] = json.loads(job[field])
+        for field in ("progress", "total", "attempts", "max_attempts"):
+            job[field] = int(job.get(field, 0))
+        return job
+
+    async def claim(self, timeout: float) -> Optional[dict]:
+        """Block until a job is available, move it to processing and mark it running."""
+        job_id = await self.redis.blmove(QUEUE_KEY, PROCESSING_KEY, timeout, "RIGHT", "LEFT")
+        if job_id is None:
+            return None
+        key = JOB_KEY.format(job_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hincrby(key, "attempts", 1)
+            pipe.hset(key, mapping={"status": RUNNING, "started_at": _now(),
+                                    "heartbeat_at": time.time()})
+            await pipe.execute()
+        return await self.get(job_id)
+
+    async def heartbeat(self, job_id: str) -> None:
+        await self.redis.hset(JOB_KEY.format(job_id), "heartbeat_at", time.time())
+
+    async def set_progress(self, job_id: str, done: int, total: Optional[int] = None) -> None:
+        mapping = {"progress": done, "heartbeat_at": time.time()}
+        if total is not None:
+            mapping["total"] = total
+        await self.redis.hset(JOB_KEY.format(job_id), mapping=mapping)
+
+    async def complete(self, job_id: str, result: Any = None) -> None:
+        key = JOB_KEY.format(job_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={"status": SUCCEEDED, "finished_at": _now(),
+                                    "result": json.dumps(result, default=str)})
+            pipe.hdel(key, "error")
+            pipe.lrem(PROCESSING_KEY, 0, job_id)
+            pipe.expire(key, settings.JOB_RESULT_TTL_SECONDS)
+            await pipe.execute()
+
+    async def fail(self, job_id: str, error: str, retry: bool = True) -> str:
+        """
+        Record a failed attempt and either schedule a retry with exponential
+        backoff or mark the job as failed for good. Pass ``retry=False`` for
+        errors another attempt can't fix (bad payload, unknown job type).
+
+        Returns:
+            The job's new status
+        """
+        key = JOB_KEY.format(job_id)
+        job = await self.get(job_id)
+        retry = retry and job is not None and job["attempts"] < job["max_attempts"]
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(PROCESSING_KEY, 0, job_id)
+            if retry:
+                delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job["attempts"] - 1)
+                pipe.hset(key, mapping={"status": RETRYING, "error": error})
+                pipe.hdel(key, "heartbeat_at")
+                pipe.zadd(DELAYED_KEY, {job_id: time.time() + delay})
+            else:
+                pipe.hset(key, mapping={"status": FAILED, "error": error, "finished_at": _now()})
+                pipe.expire(key, settings.JOB_RESULT_TTL_SECONDS)
+            await pipe.execute()
+        return RETRYING if retry else FAILED
+
+    async def promote_due(self) -> int:
+        """Move retries whose backoff has elapsed back onto the queue."""
+        return await self.redis.eval(PROMOTE_DUE_SCRIPT, 2, DELAYED_KEY, QUEUE_KEY, time.time())
+
+    async def requeue_stale(self, visibility_timeout: float) -> List[str]:
+        """
+        Recover jobs whose worker stopped heartbeating (crash, OOM kill).
+        Each stale job counts as a failed attempt.
+        """
+        recovered = []
+        cutoff = time.time() - visibility_timeout
+        for job_id in await self.redis.lrange(PROCESSING_KEY, 0, -1):
+            key = JOB_KEY.format(job_id)
+            heartbeat = await self.redis.hget(key, "heartbeat_at")
+            if heartbeat is None:
+                if not await self.redis.exists(key):
+                    # Record expired or deleted; nothing to recover
+                    await self.redis.lrem(PROCESSING_KEY, 0, job_id)
+                    continue
+                # Claimed a moment ago, or the worker died between BLMOVE and
+                # recording the claim. Start the clock now: a live worker
+                # overwrites it, a dead one leaves it to go stale.
+                await self.redis.hsetnx(key, "heartbeat_at", time.time())
+                continue
+            if float(heartbeat) >= cutoff:
+                continue
+            # Only the worker that wins the LREM recovers the job
+            if await self.redis.lrem(PROCESSING_KEY, 1, job_id):
+                await self.fail(job_id, "Worker stopped responding")
+                recovered.append(job_id)
+        return recovered
@@ -0,0 +1,203 @@
+"""
+Product Page Cache
+Redis cache of encoded product list pages and their compressed variants,
+with an in-process copy used when Redis is unavailable and a long-lived
+stale copy served while MongoDB is down
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+import redis.asyncio as redis
+from app.core.compression import compress_body
+from app.core.config import settings
+from app.core.resilience import UNAVAILABLE_ERRORS, record_fallback, redis_breaker
+
+# All pages live in one hash so a write invalidates them with a single DEL.
+# Compressed variants live in one hash per encoding, keyed by the same page
+# field and expiring with the page hash, so a page key can never name a
+# variant.
+CACHE_KEY = "products_list"
+VARIANT_KEY = "products_list:{}"
+ENCODINGS = ("gzip", "zstd")
+# Stale copies are separate keys, each with its own TTL, tracked in a sorted
+# set by when they were stored so the number kept is bounded
+STALE_KEY = "products_list:stale:{}"
+STALE_INDEX_KEY = "products_list:stale_index"
+
+
+# Store a variant only if the page still holds the body it was compressed
+# from; it may have been invalidated or re-cached since it was read. The
+# variant hash takes the page hash's remaining TTL so both expire together.
+STORE_VARIANT_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[3])
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl > 0 then
+    redis.call('PEXPIRE', KEYS[2], ttl)
+end
+return 1
+"""
+
+# Cache a page and any variants already produced for it. Pages expire
+# together, CACHE_EXPIRATION_SECONDS after the first one was cached, and
+# variant hashes are aligned to that. KEYS[2..] are the variant hashes,
+# ARGV[4..] their payloads in the same order.
+STORE_PAGE_SCRIPT = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3], 'NX')
+local ttl = redis.call('PTTL', KEYS[1])
+for i = 2, #KEYS do
+    redis.call('HSET', KEYS[i], ARGV[1], ARGV[i + 2])
+    redis.call('PEXPIRE', KEYS[i], ttl)
+end
+return 1
+"""
+
+# Store a stale copy, forget index entries whose key has expired, then
+# evict the oldest copies beyond the cap. The page key is filtered
+# free-form query input, so without the cap clients could grow it at will.
+STORE_STALE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', tonumber(ARGV[3]) - tonumber(ARGV[4]))
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[4])
+local excess = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[5])
+if excess > 0 then
+    for _, page in ipairs(redis.call('ZRANGE', KEYS[1], 0, excess - 1)) do
+        redis.call('DEL', ARGV[6] .. page)
+    end
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, excess - 1)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return excess
+"""
+
+
+def page_key(skip: int, limit: int, filters: Optional[dict] = None) -> str:
+    """
+    Cache key for a list page. Values are URL-encoded, so a filter value
+    can't imitate another parameter or the variant separator.
+    """
+    params = [("skip", skip), ("limit", limit)]
+    params += [(name, value) for name, value in sorted((filters or {}).items()) if value is not None]
+    return urlencode(params)
+
+
+class LocalPageCache:
+    """Small per-process LRU of page bodies and when they were stored."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+
+    def get(self, page: str, max_age: Optional[float] = None) -> Optional[bytes]:
+        entry = self.entries.get(page)
+        if entry is None:
+            return None
+        body, stored_at = entry
+        if max_age is not None and time.monotonic() - stored_at > max_age:
+            return None
+        self.entries.move_to_end(page)
+        return body
+
+    def put(self, page: str, body: bytes) -> None:
+        self.entries[page] = (body, time.monotonic())
+        self.entries.move_to_end(page)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def expire_all(self) -> None:
+        # Keep bodies for stale serving, but make them too old to count as fresh
+        for page, (body, _) in self.entries.items():
+            self.entries[page] = (body, float("-inf"))
+
+
+local_pages = LocalPageCache(settings.LOCAL_CACHE_MAX_ENTRIES)
+
+
+class ProductPageCache:
+    """
+    Every Redis call goes through the Redis circuit breaker; when it is open
+    or a call fails, reads fall back to the local copy and writes are skipped,
+    so a Redis outage never fails a request.
+
+    Pages are returned as ``(payload, content_encoding)``: the compressed
+    variant for the negotiated encoding when there is one, compressed once
+    and stored on first request, otherwise the JSON body.
+    """
+
+    def __init__(self, redis_client: redis.Redis, local: LocalPageCache = local_pages):
+        self.redis = redis_client
+        self.local = local
+
+    async def get(self, page: str, encoding: Optional[str] = None) -> Optional[Tuple[bytes, Optional[str]]]:
+        try:
+            if encoding is None:
+                body, encoded = await redis_breaker.call(self.redis.hget(CACHE_KEY, page)), None
+            else:
+                # One round trip for both; the variant is absent for small pages
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.hget(CACHE_KEY, page)
+                    pipe.hget(VARIANT_KEY.format(encoding), page)
+                    body, encoded = await redis_breaker.call(pipe.execute())
+        except UNAVAILABLE_ERRORS:
+            record_fallback("cache.local")
+            # Compressed, if at all, by CompressionMiddleware
+            body = self.local.get(page, max_age=settings.CACHE_EXPIRATION_SECONDS)
+            return None if body is None else (body, None)
+        if encoded and body:
+            return encoded, encoding
+        if not body:
+            return None
+        payload, content_encoding = compress_body(body, encoding)
+        if content_encoding is not None:
+            await self._store_variant(page, body, content_encoding, payload)
+        return payload, content_encoding
+
+    async def set(self, page: str, body: bytes, variants: Optional[Dict[str, bytes]] = None) -> None:
+        """Cache a page's JSON body, plus any compressed variants already produced for the response."""
+        self.local.put(page, body)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                variants = variants or {}
+                pipe.eval(
+                    STORE_PAGE_SCRIPT, 1 + len(variants),
+                    CACHE_KEY, *(VARIANT_KEY.format(encoding) for encoding in variants),
+                    page, body, settings.CACHE_EXPIRATION_SECONDS, *variants.values(),
+                )
+                pipe.eval(
+                    STORE_STALE_SCRIPT, 2, STALE_INDEX_KEY, STALE_KEY.format(page),
+                    page, body, time.time(), settings.STALE_CACHE_SECONDS,
+                    settings.STALE_CACHE_MAX_PAGES, STALE_KEY.format(""),
+                )
+                await redis_breaker.call(pipe.execute())
+        except UNAVAILABLE_ERRORS:
+            record_fallback("cache.write_skipped")
+
+    async def _store_variant(self, page: str, body: bytes, encoding: str, payload: bytes) -> None:
+        try:
+            await redis_breaker.call(self.redis.eval(
+                STORE_VARIANT_SCRIPT, 2, CACHE_KEY, VARIANT_KEY.format(encoding), page, body, payload
+            ))
+        except UNAVAILABLE_ERRORS:
+            record_fallback("cache.write_skipped")
+
+    async def get_stale(self, page: str) -> Optional[bytes]:
+        """Last known body for a page regardless of age, for when MongoDB is unavailable."""
+        try:
+            body = await redis_breaker.call(self.redis.get(STALE_KEY.format(page)))
+        except UNAVAILABLE_ERRORS:
+            body = None
+        return body or self.local.get(page)
+
+    async def invalidate(self) -> None:
+        self.local.expire_all()
+        try:
+            await redis_breaker.call(self.redis.delete(
+                CACHE_KEY, *(VARIANT_KEY.format(encoding) for encoding in ENCODINGS)
+            ))
+        except UNAVAILABLE_ERRORS:
+            # Pages already in Redis live out their TTL
+            record_fallback("cache.invalidate_skipped")
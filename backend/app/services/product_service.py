@@ -1,21 +1,56 @@
+import logging
+from datetime import datetime
 from typing import List, Optional
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 from app.schemas.product import ProductCreate, ProductUpdate
 from app.models.common import PyObjectId
+from app.services.catalog_replica import CatalogReplica
+from app.services.events import ProductEventBroker
+from app.services.stats_service import CatalogStatsService
+
+logger = logging.getLogger(__name__)
+
+# Fields ProductResponse needs; _id is always returned
+PRODUCT_RESPONSE_PROJECTION = {"name": 1, "price": 1, "category": 1}
+
+def product_filter(category: Optional[str] = None, min_price: Optional[float] = None,
+                   max_price: Optional[float] = None) -> dict:
+    """MongoDB query for the list filters; price bounds are inclusive."""
+    query = {}
+    if category is not None:
+        query["category"] = category
+    if min_price is not None or max_price is not None:
+        query["price"] = {}
+        if min_price is not None:
+            query["price"]["$gte"] = min_price
+        if max_price is not None:
+            query["price"]["$lte"] = max_price
+    return query
 
 class ProductService:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, events: Optional[ProductEventBroker] = None,
+                 replica: Optional[CatalogReplica] = None):
         self.collection = db["products"]
+        self.stats = CatalogStatsService(db)
+        self.events = events
+        self.replica = replica
 
     async def create_product(self, product_in: ProductCreate) -> dict:
         product_data = product_in.model_dump()
+        # updated_at is the high-water mark catalog replicas poll on
+        product_data["updated_at"] = datetime.utcnow()
         result = await self.collection.insert_one(product_data)
         product_data["_id"] = result.inserted_id
+        await self._after_write(self.stats.record_create, product_data)
+        await self._publish("create", product_data["_id"], product_in.model_dump())
         return product_data
 
-    async def get_products(self, skip: int = 0, limit: int = 10) -> List[dict]:
-        cursor = self.collection.find().skip(skip).limit(limit)
+    async def get_products(self, skip: int = 0, limit: int = 10,
+                           projection: Optional[dict] = None, **filters) -> List[dict]:
+        # Sorted so pages are stable and match the catalog replica's order
+        cursor = self.collection.find(product_filter(**filters), projection).sort("_id", 1).skip(skip).limit(limit)
         products = await cursor.to_list(length=limit)
         return products
 
@@ -27,18 +62,44 @@ class ProductService:
     async def update_product(self, product_id: str, product_in: ProductUpdate) -> Optional[dict]:
         if not ObjectId.is_valid(product_id):
             return None
-        
+
         update_data = product_in.model_dump(exclude_unset=True)
         if not update_data:
             return await self.get_product(product_id)
-            
-        await self.collection.update_one(
-            {"_id": ObjectId(product_id)}, {"$set": update_data}
+
+        before = await self.collection.find_one_and_update(
+            {"_id": ObjectId(product_id)}, {"$set": {**update_data, "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.BEFORE,
         )
-        return await self.get_product(product_id)
+        if before is None:
+            return None
+        after = {**before, **update_data}
+        await self._after_write(self.stats.record_update, before, after)
+        await self._publish("update", before["_id"], update_data)
+        return after
 
     async def delete_product(self, product_id: str) -> bool:
         if not ObjectId.is_valid(product_id):
             return False
-        result = await self.collection.delete_one({"_id": ObjectId(product_id)})
-        return result.deleted_count > 0
\ No newline at end of file
+        deleted = await self.collection.find_one_and_delete({"_id": ObjectId(product_id)})
+        if deleted is None:
+            return False
+        await self._after_write(self.stats.record_delete, deleted)
+        await self._publish("delete", deleted["_id"])
+        return True
+
+    async def _publish(self, op: str, product_id: ObjectId, fields: Optional[dict] = None) -> None:
+        if self.replica is not None and self.replica.ready:
+            # Read-your-writes on this worker; the event reaches the others
+            self.replica.apply(op, str(product_id), fields)
+        if self.events is not None:
+            await self._after_write(self.events.publish, op, str(product_id), fields)
+
+    async def _after_write(self, action, *args) -> None:
+        # Statistics and change events are derived from the write: a failure
+        # here must not fail the write itself (a stats recompute repairs drift,
+        # SSE clients resync on the next event or reconnect).
+        try:
+            await action(*args)
+        except Exception as e:
+            logger.error(f"Post-write {action.__qualname__} failed: {str(e)}")
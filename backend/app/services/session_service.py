@@ -0,0 +1,150 @@
+"""
+Session Service
+Refresh-token sessions stored in Redis, with rotation, reuse detection and
+revocation, so clients renew access tokens without a bcrypt password login
+"""
+import secrets
+from datetime import datetime
+from typing import Tuple
+import redis.asyncio as redis
+from app.core.config import settings
+from app.core.security import create_refresh_token, hash_token, parse_refresh_token
+
+SESSION_KEY = "session:{}"
+REVOKED_KEY = "session_revoked:{}"
+# Hashes of a session's rotated-out tokens, newest first, for reuse detection
+ROTATED_KEY = "session_rotated:{}"
+ROTATED_HISTORY = 100
+
+# Rotation must be atomic: two concurrent refreshes with the same token
+# would otherwise both succeed. Returns {1, user_id} on success, {0} if the
+# session doesn't exist or the token was never issued for it, and {-1} if a
+# rotated-out token was replayed, in which case the whole session is
+# revoked. Only a token the session actually issued counts as reuse: the
+# session id is readable in every access token's `sid` claim, so treating
+# any mismatch as reuse would let anyone who saw one log the user out.
+ROTATE_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], 'token_hash')
+if not current then
+    return {0}
+end
+if current ~= ARGV[1] then
+    if not redis.call('LPOS', KEYS[3], ARGV[1]) then
+        return {0}
+    end
+    redis.call('DEL', KEYS[1], KEYS[3])
+    redis.call('SET', KEYS[2], 1, 'EX', ARGV[4])
+    return {-1}
+end
+redis.call('HSET', KEYS[1], 'token_hash', ARGV[2], 'rotated_at', ARGV[5])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('LPUSH', KEYS[3], ARGV[1])
+redis.call('LTRIM', KEYS[3], 0, ARGV[6] - 1)
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+return {1, redis.call('HGET', KEYS[1], 'user_id')}
+"""
+
+# Logout must prove possession of the current refresh token, not just the
+# session id (which every access token carries in its `sid` claim). Returns
+# 1 if the session was revoked, 0 if the token didn't match.
+REVOKE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'token_hash') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1], KEYS[3])
+redis.call('SET', KEYS[2], 1, 'EX', ARGV[2])
+return 1
+"""
+
+
+class RefreshTokenError(Exception):
+    """Raised when a refresh token is invalid, expired or revoked."""
+
+
+class RefreshTokenReuseError(RefreshTokenError):
+    """Raised when an already rotated refresh token is presented again."""
+
+
+class SessionService:
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+        self.session_ttl = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+        # Revocations only need to outlive the access tokens issued for the session
+        self.revocation_ttl = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    async def create(self, user_id: str) -> Tuple[str, str]:
+        """
+        Start a new session for a user who just logged in.
+
+        Returns:
+            (session_id, refresh_token)
+        """
+        session_id = secrets.token_urlsafe(16)
+        refresh_token = create_refresh_token(session_id)
+        key = SESSION_KEY.format(session_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                "user_id": user_id,
+                "token_hash": hash_token(refresh_token),
+                "created_at": datetime.utcnow().isoformat(),
+            })
+            pipe.expire(key, self.session_ttl)
+            await pipe.execute()
+        return session_id, refresh_token
+
+    async def rotate(self, refresh_token: str) -> Tuple[str, str, str]:
+        """
+        Exchange a refresh token for a new one.
+
+        Returns:
+            (user_id, session_id, new_refresh_token)
+
+        Raises:
+            RefreshTokenReuseError: If the token was already rotated; the session is revoked
+            RefreshTokenError: If the token is malformed, expired or revoked
+        """
+        parsed = parse_refresh_token(refresh_token)
+        if parsed is None:
+            raise RefreshTokenError("Invalid refresh token")
+        session_id, token_hash = parsed
+        new_token = create_refresh_token(session_id)
+        result = await self.redis.eval(
+            ROTATE_SCRIPT, 3,
+            SESSION_KEY.format(session_id), REVOKED_KEY.format(session_id), ROTATED_KEY.format(session_id),
+            token_hash, hash_token(new_token), self.session_ttl, self.revocation_ttl,
+            datetime.utcnow().isoformat(), ROTATED_HISTORY,
+        )
+        if result[0] == -1:
+            raise RefreshTokenReuseError("Refresh token reuse detected; session revoked")
+        if result[0] != 1:
+            raise RefreshTokenError("Invalid or expired refresh token")
+        return result[1], session_id, new_token
+
+    async def revoke(self, session_id: str) -> None:
+        """End a session and reject access tokens already issued for it."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(SESSION_KEY.format(session_id), ROTATED_KEY.format(session_id))
+            pipe.set(REVOKED_KEY.format(session_id), 1, ex=self.revocation_ttl)
+            await pipe.execute()
+
+    async def revoke_with_token(self, refresh_token: str) -> bool:
+        """
+        Revoke the session behind a refresh token, but only if it is the
+        session's current token.
+
+        Returns:
+            True if the session was revoked
+        """
+        parsed = parse_refresh_token(refresh_token)
+        if parsed is None:
+            return False
+        session_id, token_hash = parsed
+        result = await self.redis.eval(
+            REVOKE_SCRIPT, 3,
+            SESSION_KEY.format(session_id), REVOKED_KEY.format(session_id), ROTATED_KEY.format(session_id),
+            token_hash, self.revocation_ttl,
+        )
+        return result == 1
+
+    async def is_revoked(self, session_id: str) -> bool:
+        return bool(await self.redis.exists(REVOKED_KEY.format(session_id)))
@@ -0,0 +1,194 @@
+"""
+Catalog Statistics Service
+Maintains per-category product statistics in a summary collection so they
+can be served in O(categories) instead of scanning every product
+"""
+import logging
+from bisect import bisect_right
+from datetime import datetime
+from typing import List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DeleteOne, ReplaceOne, ReturnDocument
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATS_COLLECTION = "product_stats"
+
+
+class CatalogStatsService:
+    """
+    Incrementally maintained statistics, one summary document per category:
+
+        {"_id": <category>, "count": int, "total": float,
+         "min_price": float, "max_price": float,
+         "histogram": {"b0": int, "b1": int, ...}, "updated_at": datetime}
+
+    Bucket ``bN`` holds prices in ``[bounds[N-1], bounds[N])``; the first
+    bucket is open below and the last one is open above.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.products = db["products"]
+        self.collection = db[STATS_COLLECTION]
+        self.bounds = sorted(settings.STATS_PRICE_BUCKETS)
+
+    def _bucket(self, price: float) -> str:
+        return f"b{bisect_right(self.bounds, price)}"
+
+    async def record_create(self, product: dict) -> None:
+        """Account for a newly inserted product."""
+        price = product["price"]
+        await self.collection.update_one(
+            {"_id": product["category"]},
+            {
+                "$inc": {"count": 1, "total": price, f"histogram.{self._bucket(price)}": 1},
+                "$min": {"min_price": price},
+                "$max": {"max_price": price},
+                "$set": {"updated_at": datetime.utcnow()},
+            },
+            upsert=True,
+        )
+
+    async def record_delete(self, product: dict) -> None:
+        """Account for a product that has already been removed from the catalog."""
+        price = product["price"]
+        category = product["category"]
+        summary = await self.collection.find_one_and_update(
+            {"_id": category},
+            {
+                "$inc": {"count": -1, "total": -price, f"histogram.{self._bucket(price)}": -1},
+                "$set": {"updated_at": datetime.utcnow()},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+        if summary is None:
+            return
+        if summary["count"] <= 0:
+            await self.collection.delete_one({"_id": category, "count": {"$lte": 0}})
+        elif price <= summary["min_price"] or price >= summary["max_price"]:
+            # The removed product may have held the min or max; those can't be
+            # un-applied incrementally, so rebuild just this category.
+            await self.recompute_category(category)
+
+    async def record_update(self, before: dict, after: dict) -> None:
+        """Account for a product whose price and/or category changed."""
+        if before["category"] != after["category"]:
+            await self.record_delete(before)
+            await self.record_create(after)
+            return
+
+        old_price, new_price = before["price"], after["price"]
+        if old_price == new_price:
+            return
+
+        update = {
+            "$inc": {"total": new_price - old_price},
+            "$min": {"min_price": new_price},
+            "$max": {"max_price": new_price},
+            "$set": {"updated_at": datetime.utcnow()},
+        }
+        old_bucket, new_bucket = self._bucket(old_price), self._bucket(new_price)
+        if old_bucket != new_bucket:
+            update["$inc"][f"histogram.{old_bucket}"] = -1
+            update["$inc"][f"histogram.{new_bucket}"] = 1
+
+        summary = await self.collection.find_one_and_update(
+            {"_id": before["category"]}, update, return_document=ReturnDocument.AFTER
+        )
+        if summary is None:
+            await self.recompute_category(before["category"])
+        elif old_price in (summary["min_price"], summary["max_price"]):
+            await self.recompute_category(before["category"])
+
+    def _pipeline(self, match: Optional[dict] = None) -> List[dict]:
+        bucket_index = {
+            "$size": {
+                "$filter": {"input": self.bounds, "cond": {"$lte": ["$$this", "$price"]}}
+            }
+        }
+        pipeline = [{"$match": match}] if match else []
+        pipeline.append({
+            "$group": {
+                "_id": {"category": "$category", "bucket": bucket_index},
+                "count": {"$sum": 1},
+                "total": {"$sum": "$price"},
+                "min_price": {"$min": "$price"},
+                "max_price": {"$max": "$price"},
+            }
+        })
+        return pipeline
+
+    async def _aggregate(self, match: Optional[dict] = None) -> dict:
+        """Run the grouping pipeline and fold bucket rows into summary documents."""
+        now = datetime.utcnow()
+        summaries = {}
+        async for row in self.products.aggregate(self._pipeline(match)):
+            category = row["_id"]["category"]
+            summary = summaries.setdefault(category, {
+                "_id": category,
+                "count": 0,
+                "total": 0.0,
+                "min_price": row["min_price"],
+                "max_price": row["max_price"],
+                "histogram": {},
+                "updated_at": now,
+            })
+            summary["count"] += row["count"]
+            summary["total"] += row["total"]
+            summary["min_price"] = min(summary["min_price"], row["min_price"])
+            summary["max_price"] = max(summary["max_price"], row["max_price"])
+            summary["histogram"][f"b{row['_id']['bucket']}"] = row["count"]
+        return summaries
+
+    async def recompute_category(self, category: str) -> None:
+        """Rebuild the summary for a single category from the products collection."""
+        summaries = await self._aggregate({"category": category})
+        if category in summaries:
+            await self.collection.replace_one({"_id": category}, summaries[category], upsert=True)
+        else:
+            await self.collection.delete_one({"_id": category})
+
+    async def recompute_all(self) -> int:
+        """
+        Rebuild every category summary with a single aggregation pipeline.
+
+        Returns:
+            Number of categories written
+        """
+        summaries = await self._aggregate()
+        existing = await self.collection.distinct("_id")
+        operations = [
+            ReplaceOne({"_id": category}, summary, upsert=True)
+            for category, summary in summaries.items()
+        ]
+        operations += [DeleteOne({"_id": category}) for category in existing if category not in summaries]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+        logger.info(f"Recomputed catalog statistics for {len(summaries)} categories")
+        return len(summaries)
+
+    async def get_stats(self) -> dict:
+        """Read all category summaries and shape them for the API."""
+        edges = [None] + self.bounds + [None]
+        categories = []
+        total_products = 0
+        async for summary in self.collection.find().sort("_id", 1):
+            count = summary["count"]
+            if count <= 0:
+                continue
+            total_products += count
+            histogram = summary.get("histogram", {})
+            categories.append({
+                "category": summary["_id"],
+                "count": count,
+                "min_price": summary["min_price"],
+                "max_price": summary["max_price"],
+                "avg_price": summary["total"] / count,
+                "histogram": [
+                    {"min": edges[i], "max": edges[i + 1], "count": histogram.get(f"b{i}", 0)}
+                    for i in range(len(edges) - 1)
+                ],
+                "updated_at": summary.get("updated_at"),
+            })
+        return {"total_products": total_products, "categories": categories}
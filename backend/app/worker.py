@@ -0,0 +1,126 @@
+"""
+Background Job Worker
+Runs queued catalog jobs outside the API processes, reusing the same
+Database, Redis and ProductService setup as the web app.
+
+Usage:
+    python -m app.worker
+"""
+import asyncio
+import logging
+import signal
+from typing import Set
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.db.mongodb import db, get_database
+from app.db.redis import redis_db
+from app.services.events import product_events
+from app.services.job_handlers import JOB_HANDLERS, JobContext, PermanentJobError
+from app.services.job_service import JobQueue
+from app.services.product_service import ProductService
+
+logger = logging.getLogger("app.worker")
+
+
+class JobWorker:
+    """Claims jobs while fewer than ``concurrency`` are running and drains on stop."""
+
+    def __init__(self, queue: JobQueue, concurrency: int):
+        self.queue = queue
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.running: Set[asyncio.Task] = set()
+        self.stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        logger.info("Stopping job worker, waiting for running jobs to finish...")
+        self.stopping.set()
+
+    async def run(self) -> None:
+        maintenance = asyncio.create_task(self._maintenance())
+        try:
+            while not self.stopping.is_set():
+                await self.semaphore.acquire()
+                if self.stopping.is_set():
+                    self.semaphore.release()
+                    break
+                try:
+                    job = await self.queue.claim(timeout=settings.JOB_POLL_SECONDS)
+                except Exception as e:
+                    logger.error(f"Failed to claim job: {str(e)}")
+                    job = None
+                    await asyncio.sleep(1)
+                if job is None:
+                    self.semaphore.release()
+                    continue
+                task = asyncio.create_task(self._execute(job))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+        finally:
+            maintenance.cancel()
+            if self.running:
+                await asyncio.gather(*self.running, return_exceptions=True)
+
+    async def _execute(self, job: dict) -> None:
+        job_id = job["id"]
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            handler = JOB_HANDLERS.get(job["type"])
+            if handler is None:
+                raise PermanentJobError(f"Unknown job type {job['type']}")
+            logger.info(f"Running job {job_id} ({job['type']}), attempt {job['attempts']}")
+            context = JobContext(job, self.queue, ProductService(get_database(), events=product_events))
+            result = await handler(context, job["payload"])
+            await self.queue.complete(job_id, result)
+            logger.info(f"Job {job_id} succeeded")
+        except PermanentJobError as e:
+            await self.queue.fail(job_id, str(e), retry=False)
+            logger.error(f"Job {job_id} failed: {str(e)}")
+        except Exception as e:
+            status = await self.queue.fail(job_id, str(e))
+            logger.error(f"Job {job_id} attempt {job['attempts']} failed ({status}): {str(e)}")
+        finally:
+            heartbeat.cancel()
+            self.semaphore.release()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(settings.JOB_VISIBILITY_TIMEOUT_SECONDS / 4)
+            await self.queue.heartbeat(job_id)
+
+    async def _maintenance(self) -> None:
+        """Promote due retries and recover jobs abandoned by crashed workers."""
+        while True:
+            try:
+                await self.queue.promote_due()
+                for job_id in await self.queue.requeue_stale(settings.JOB_VISIBILITY_TIMEOUT_SECONDS):
+                    logger.warning(f"Recovered stale job {job_id}")
+            except Exception as e:
+                logger.error(f"Job maintenance failed: {str(e)}")
+            await asyncio.sleep(1)
+
+
+async def main() -> None:
+    setup_logging()
+    logger.info("Connecting to MongoDB...")
+    db.connect()
+    logger.info("Connecting to Redis...")
+    redis_db.connect()
+    await product_events.start(redis_db.client, listen=False)
+
+    worker = JobWorker(JobQueue(redis_db.client), settings.JOB_CONCURRENCY)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    logger.info(f"Job worker started with concurrency {settings.JOB_CONCURRENCY}")
+    try:
+        await worker.run()
+    finally:
+        await redis_db.close()
+        db.close()
+        logger.info("Job worker stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
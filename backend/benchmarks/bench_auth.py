@@ -0,0 +1,64 @@
+"""
+Login vs Refresh CPU Benchmark
+Compares the server-side CPU cost of renewing an access token with a
+password login (bcrypt verify + JWT) against the refresh-token flow
+(SHA-256 of the presented and new token + JWT).
+
+Network and database round trips are excluded: login also pays a `users`
+lookup in MongoDB, refresh a single Redis EVAL.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_auth [--iterations 20]
+"""
+import argparse
+import time
+
+from app.core.config import settings
+from app.core.security import (
+    create_access_token, create_refresh_token, get_password_hash, hash_token,
+    parse_refresh_token, verify_password,
+)
+
+
+def _time_per_op(func, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    user_id = "507f1f77bcf86cd799439011"
+    hashed = get_password_hash("SecurePassword123")
+    refresh_token = create_refresh_token("session")
+
+    def login():
+        verify_password("SecurePassword123", hashed)
+        create_access_token(user_id)
+
+    def refresh():
+        session_id, _ = parse_refresh_token(refresh_token)
+        hash_token(create_refresh_token(session_id))
+        create_access_token(user_id, session_id=session_id)
+
+    login_cost = _time_per_op(login, args.iterations)
+    refresh_cost = _time_per_op(refresh, args.iterations * 100)
+
+    # One session renewing its access token for a working day
+    renewals = 8 * 60 // settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    before = renewals * login_cost
+    after = login_cost + (renewals - 1) * refresh_cost
+
+    print(f"login   (bcrypt + JWT):    {login_cost * 1000:8.3f} ms CPU/op")
+    print(f"refresh (sha256 + JWT):    {refresh_cost * 1000:8.3f} ms CPU/op")
+    print(f"speedup per renewal:       {login_cost / refresh_cost:8.0f}x")
+    print(f"8h session, {renewals} renewals: {before * 1000:8.1f} ms -> {after * 1000:.1f} ms CPU "
+          f"({(1 - after / before) * 100:.0f}% saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Response Compression Benchmark
+Bandwidth and CPU trade-offs of compressing `list_products` pages: size,
+compression and decompression time per page for gzip and zstd at several
+levels, and the transfer time saved on a given link.
+
+Cache hits serve the stored compressed bytes, so only the first request for
+a page pays the compression time; without the stored copy every hit would.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_compression [--items 10 100 1000] [--mbps 10]
+"""
+import argparse
+import gzip
+import timeit
+from typing import Callable, List, Tuple
+
+from bson import ObjectId
+
+from app.api.endpoints.items import encode_product_page
+from app.core.compression import ZSTD_AVAILABLE
+
+CATEGORIES = ["Electronics", "Accessories", "Home", "Books", "Sports"]
+
+
+def make_page(items: int) -> bytes:
+    return encode_product_page([
+        {"_id": ObjectId(), "name": f"Premium Wireless Headphones {i}",
+         "price": 19.99 + i * 3.5, "category": CATEGORIES[i % len(CATEGORIES)]}
+        for i in range(items)
+    ])
+
+
+def codecs() -> List[Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]]:
+    result = [
+        (f"gzip-{level}", lambda b, level=level: gzip.compress(b, compresslevel=level, mtime=0), gzip.decompress)
+        for level in (1, 6, 9)
+    ]
+    if ZSTD_AVAILABLE:
+        import zstandard
+        for level in (1, 3, 9):
+            result.append((
+                f"zstd-{level}",
+                zstandard.ZstdCompressor(level=level).compress,
+                zstandard.ZstdDecompressor().decompress,
+            ))
+    return result
+
+
+def _per_call_us(func: Callable[[], object]) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--mbps", type=float, default=10.0, help="client link speed for transfer time")
+    args = parser.parse_args()
+
+    if not ZSTD_AVAILABLE:
+        print("zstandard not installed: zstd rows skipped (pip install zstandard)")
+    bytes_per_ms = args.mbps * 1e6 / 8 / 1000
+
+    for items in args.items:
+        body = make_page(items)
+        raw_ms = len(body) / bytes_per_ms
+        print(f"\n{items} products, {len(body)} bytes JSON, {raw_ms:.2f} ms at {args.mbps:g} Mbit/s")
+        print(f"{'codec':>8} {'bytes':>8} {'ratio':>6} {'compress us':>12} {'decompress us':>14} "
+              f"{'transfer ms':>12} {'saved ms':>9}")
+        for name, compress, decompress in codecs():
+            payload = compress(body)
+            compress_us = _per_call_us(lambda: compress(body))
+            decompress_us = _per_call_us(lambda: decompress(payload))
+            transfer_ms = len(payload) / bytes_per_ms
+            # Net of the server compressing on a miss and the client decompressing
+            saved_ms = raw_ms - transfer_ms - (compress_us + decompress_us) / 1000
+            print(f"{name:>8} {len(payload):>8} {len(body) / len(payload):>6.1f} {compress_us:>12.1f} "
+                  f"{decompress_us:>14.1f} {transfer_ms:>12.2f} {saved_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
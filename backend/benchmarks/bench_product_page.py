@@ -0,0 +1,102 @@
+"""
+Product Page Read-Path Benchmark
+Measures CPU time and peak memory for producing one page of `list_products`
+on a cache miss and a cache hit, comparing the previous path (full
+documents, copied and re-encoded per consumer) with the current one
+(projected documents encoded once to bytes shared by Redis and the response).
+
+Mongo and Redis are not contacted: documents are decoded from pre-encoded
+BSON, as the driver would, and cached values are plain bytes.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_product_page [--items 100] [--extra-bytes 0]
+"""
+import argparse
+import json
+import timeit
+import tracemalloc
+from typing import List
+
+import bson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+
+from app.api.endpoints.items import PRODUCT_LIST_ADAPTER, encode_product_page
+from app.services.product_service import PRODUCT_RESPONSE_PROJECTION
+
+
+def make_page(items: int, extra_bytes: int):
+    full, projected = [], []
+    for i in range(items):
+        doc = {"_id": ObjectId(), "name": f"Premium Wireless Headphones {i}",
+               "price": 299.99 + i, "category": "Electronics"}
+        projected.append(bson.encode(doc))
+        if extra_bytes:
+            doc["description"] = "x" * extra_bytes
+        full.append(bson.encode(doc))
+    return full, projected
+
+
+def previous_miss(full: List[bytes]) -> bytes:
+    products = [bson.decode(raw) for raw in full]
+    serialized = [{**p, "_id": str(p["_id"])} for p in products]
+    json.dumps(serialized, default=str)  # cache value
+    return PRODUCT_LIST_ADAPTER.dump_json(PRODUCT_LIST_ADAPTER.validate_python(serialized), by_alias=True)
+
+
+def previous_hit(cached: str) -> bytes:
+    products = json.loads(cached)
+    return PRODUCT_LIST_ADAPTER.dump_json(PRODUCT_LIST_ADAPTER.validate_python(products), by_alias=True)
+
+
+def current_miss(projected: List[bytes]) -> bytes:
+    return encode_product_page([bson.decode(raw) for raw in projected])
+
+
+def raw_bson_miss(projected: List[bytes]) -> bytes:
+    # For reference: RawBSONDocument defers decoding, but the first field
+    # access inflates the whole document, so it only adds overhead here.
+    products = [RawBSONDocument(raw) for raw in projected]
+    return encode_product_page([
+        {"_id": p["_id"], "name": p["name"], "price": p["price"], "category": p["category"]}
+        for p in products
+    ])
+
+
+def measure(func, *args, number: int = 500):
+    seconds = timeit.timeit(lambda: func(*args), number=number) / number
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds * 1e6, peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--extra-bytes", type=int, default=0,
+                        help="size of a field not in ProductResponse, to show the projection's effect")
+    args = parser.parse_args()
+
+    full, projected = make_page(args.items, args.extra_bytes)
+    body = current_miss(projected)
+    assert previous_miss(full) == body, "paths must produce identical response bodies"
+    cached_str = json.dumps(json.loads(body))
+
+    print(f"{args.items}-item page, projection {sorted(PRODUCT_RESPONSE_PROJECTION)}, "
+          f"{len(body)} byte body")
+    print(f"{'path':<28}{'CPU us/page':>14}{'peak KiB':>12}")
+    for name, func, arg in (
+        ("miss, previous", previous_miss, full),
+        ("miss, current", current_miss, projected),
+        ("miss, RawBSONDocument", raw_bson_miss, projected),
+        ("hit, previous", previous_hit, cached_str),
+    ):
+        micros, peak = measure(func, arg)
+        print(f"{name:<28}{micros:>14.1f}{peak:>12.1f}")
+    print(f"{'hit, current':<28}{'0.0':>14}{'0.0':>12}  (cached bytes returned as-is)")
+
+
+if __name__ == "__main__":
+    main()
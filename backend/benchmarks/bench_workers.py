@@ -0,0 +1,156 @@
+"""
+Worker Throughput Benchmark
+Starts `python -m app.server` with one worker and with N workers and
+measures requests per second and latency for the same load.
+
+The load comes from separate client processes using keep-alive HTTP/1.1
+connections, so the client is not the bottleneck on the same host.
+Pinning clients and server to disjoint CPUs (taskset) gives cleaner numbers.
+
+`GET /` needs neither MongoDB nor Redis. To measure a real endpoint, pass
+e.g. `--path /api/v1/products/ --token <access token>` with both running.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_workers [--workers N] [--duration 10] [--connections 64]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from app.server import default_workers
+
+
+async def _connection(host: str, port: int, request: bytes, deadline: float,
+                      latencies: List[float]) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.partition(b":")
+                if name.lower() == b"content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            if not status_line.startswith(b"HTTP/1.1 2"):
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+    return errors
+
+
+def _client(host: str, port: int, request: bytes, connections: int, duration: float,
+            results: "multiprocessing.Queue") -> None:
+    async def run() -> Tuple[List[float], int]:
+        latencies: List[float] = []
+        deadline = time.perf_counter() + duration
+        errors = await asyncio.gather(*[
+            _connection(host, port, request, deadline, latencies) for _ in range(connections)
+        ])
+        return latencies, sum(errors)
+    results.put(asyncio.run(run()))
+
+
+def _wait_until_serving(host: str, port: int, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not start on {host}:{port}")
+
+
+def run_load(host: str, port: int, path: str, token: Optional[str], clients: int,
+             connections: int, duration: float) -> dict:
+    headers = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+    if token:
+        headers += f"Authorization: Bearer {token}\r\n"
+    request = (headers + "\r\n").encode()
+
+    results = multiprocessing.Queue()
+    per_client = max(1, connections // clients)
+    procs = [
+        multiprocessing.Process(target=_client, args=(host, port, request, per_client, duration, results))
+        for _ in range(clients)
+    ]
+    for proc in procs:
+        proc.start()
+    latencies: List[float] = []
+    errors = 0
+    for _ in procs:
+        client_latencies, client_errors = results.get()
+        latencies += client_latencies
+        errors += client_errors
+    for proc in procs:
+        proc.join()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def bench(workers: int, args: argparse.Namespace) -> dict:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--workers", str(workers),
+         "--host", args.host, "--port", str(args.port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_serving(args.host, args.port)
+        # Let every worker finish its lifespan before measuring
+        time.sleep(2)
+        return run_load(args.host, args.port, args.path, args.token, args.clients,
+                        args.connections, args.duration)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="load generator processes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--token", default=None, help="access token for authenticated paths")
+    args = parser.parse_args()
+
+    print(f"GET {args.path}, {args.connections} connections, {args.clients} client processes, "
+          f"{args.duration:.0f}s each, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    baseline = None
+    for workers in sorted({1, args.workers}):
+        result = bench(workers, args)
+        baseline = baseline or result["rps"]
+        print(f"{workers:>8} {result['rps']:>10.0f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+              f"{result['errors']:>7}   x{result['rps'] / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Cold Start Check
+Profiles `import app.main` in fresh interpreters with `python -X importtime`
+and fails when it exceeds a time budget or when a module that should load
+lazily was imported at startup.
+
+Startup time is what a new instance pays before it can take traffic, so it
+bounds how quickly autoscaling reacts. Run in CI on a machine comparable to
+production and tune the budget there.
+
+With --serve it also starts `uvicorn app.main:app` and measures the time to
+the first successful `GET /` (MongoDB and Redis need not be running).
+
+Usage (from the backend directory):
+    python -m benchmarks.check_cold_start [--budget-ms 1500] [--runs 3] [--top 15] [--serve]
+
+Exit status is 1 if any check fails.
+"""
+import argparse
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Only needed on some requests or with optional features enabled
+LAZY_MODULES = [
+    "passlib",  # register and login only
+    "bcrypt",
+    "zstandard",  # once a client negotiates zstd
+    "app.core.profiling",  # PROFILING_ENABLED
+    "app.worker",
+    "app.server",
+]
+
+IMPORT_SNIPPET = (
+    "import sys, app.main; "
+    f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+)
+
+
+def profile_import() -> Tuple[float, List[Tuple[int, int, str]], List[str]]:
+    """
+    Import the app in a fresh interpreter.
+
+    Returns:
+        (cumulative app.main import ms, [(self_us, cumulative_us, module)], lazy modules loaded)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name))
+    app_main_us = next(cumulative for _, cumulative, name in rows if name.strip() == "app.main")
+    # Last line only, in case something logged to stdout during the import
+    last_line = (result.stdout.strip().splitlines() or [""])[-1]
+    loaded = [m for m in last_line.split(",") if m]
+    return app_main_us / 1000, rows, loaded
+
+
+def by_package(rows: List[Tuple[int, int, str]]) -> Dict[str, float]:
+    """Self time in ms per top-level package (``app`` split one level further)."""
+    totals: Dict[str, float] = defaultdict(float)
+    for self_us, _, name in rows:
+        parts = name.strip().split(".")
+        key = ".".join(parts[:2]) if parts[0] == "app" else parts[0]
+        totals[key] += self_us / 1000
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def time_to_first_response(port: int, timeout: float = 60) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError(f"uvicorn did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="max `import app.main` time")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters; the fastest run counts")
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    parser.add_argument("--serve", action="store_true", help="also time uvicorn to the first response")
+    parser.add_argument("--serve-budget-ms", type=float, default=3000.0)
+    args = parser.parse_args()
+
+    runs = [profile_import() for _ in range(args.runs)]
+    import_ms, rows, loaded = min(runs, key=lambda run: run[0])
+    failures = []
+
+    print(f"import app.main: {import_ms:.0f} ms (budget {args.budget_ms:.0f} ms, "
+          f"best of {args.runs}: {', '.join(f'{run[0]:.0f}' for run in runs)})")
+    print(f"\n{'package':<32} {'self ms':>8}")
+    for package, ms in list(by_package(rows).items())[:args.top]:
+        print(f"{package:<32} {ms:>8.1f}")
+
+    if import_ms > args.budget_ms:
+        failures.append(f"import took {import_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    if loaded:
+        failures.append(f"imported at startup but should load lazily: {', '.join(loaded)}")
+
+    if args.serve:
+        serve_ms = time_to_first_response(_free_port())
+        print(f"\nuvicorn app.main:app to first response: {serve_ms:.0f} ms (budget {args.serve_budget_ms:.0f} ms)")
+        if serve_ms > args.serve_budget_ms:
+            failures.append(f"first response after {serve_ms:.0f} ms, over the {args.serve_budget_ms:.0f} ms budget")
+
+    print()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()